@@ -1,62 +1,74 @@
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, Form, HTTPException, Query
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import sqlite3
-from backend.email_utils import send_designer_confirmation, send_founder_confirmation
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from backend import database
+from backend import metrics
+from backend import database_matches
+from backend import database_search
+from backend import exporter
+from backend import email_utils
+from backend import rate_limit
+from backend import write_queue
+from backend.match import match_breakdown
+from backend.profile_cache import LRUCache
+from backend.email_outbox import run_outbox_worker
 
 
 # ------------------------------
 # App Setup
 # ------------------------------
 
+class TimedTemplates(Jinja2Templates):
+    """Jinja2Templates whose rendering counts as the request's "template" stage."""
+
+    def TemplateResponse(self, *args, **kwargs):
+        with metrics.stage("template"):
+            return super().TemplateResponse(*args, **kwargs)
+
+
 app = FastAPI()
+# shed submissions before they are parsed; MetricsMiddleware (outermost) still counts the 429s / 503s
+app.add_middleware(rate_limit.SubmissionLimitMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="frontend")
+templates = TimedTemplates(directory="frontend")
+admin_templates = TimedTemplates(directory=str(Path(__file__).resolve().parent / "templates"))
+
+# set to "0" when the outbox worker runs as its own process (python -m backend.email_outbox)
+EMAIL_OUTBOX_WORKER = os.getenv("EMAIL_OUTBOX_WORKER", "1") != "0"
 
-DATABASE = "matcher.db"
+ADMIN_KEY = os.getenv("ADMIN_KEY", "supersecret123")
+ADMIN_PAGE_SIZE = int(os.getenv("ADMIN_PAGE_SIZE", "50"))
+ADMIN_MATCHES_PER_FOUNDER = int(os.getenv("ADMIN_MATCHES_PER_FOUNDER", "3"))
+# rendered admin pages kept per (url, data version)
+ADMIN_PAGE_CACHE_SIZE = int(os.getenv("ADMIN_PAGE_CACHE_SIZE", "256"))
+
+admin_page_cache = LRUCache(ADMIN_PAGE_CACHE_SIZE)
 
 
 # ------------------------------
-# Database Helpers
+# Background Workers
 # ------------------------------
 
-def init_db():
-    conn = sqlite3.connect(DATABASE)
-    cur = conn.cursor()
-
-    # Designer Table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS designers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            email TEXT,
-            availability TEXT,
-            experience_interests TEXT,
-            niche_interests TEXT,
-            tools_comfort TEXT,
-            figma_skill TEXT
-        )
-    """)
-
-    # Founder Table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS founders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT,
-            email TEXT,
-            design_help_needed TEXT,
-            project_niche TEXT,
-            weekly_hours TEXT,
-            founder_support TEXT
-        )
-    """)
+@app.on_event("startup")
+async def start_background_workers():
+    database.init_db()
+    if EMAIL_OUTBOX_WORKER:
+        app.state.outbox_task = asyncio.create_task(run_outbox_worker())
 
-    conn.commit()
-    conn.close()
 
-init_db()
+@app.on_event("shutdown")
+async def stop_background_workers():
+    task = getattr(app.state, "outbox_task", None)
+    if task:
+        task.cancel()
+    write_queue.shutdown()
 
 
 # ------------------------------
@@ -93,26 +105,23 @@ async def submit_designer(
     tools_comfort: list[str] = Form(None),
     figma_skill: str = Form(...)
 ):
-    # Convert lists → comma-separated strings
-    experience_str = ", ".join(experience_interests or [])
-    niche_str = ", ".join(niche_interests or [])
-    tools_str = ", ".join(tools_comfort or [])
-
-    conn = sqlite3.connect(DATABASE)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO designers (name, email, availability, experience_interests,
-                               niche_interests, tools_comfort, figma_skill)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (name, email, availability, experience_str, niche_str, tools_str, figma_skill))
-    conn.commit()
-    conn.close()
-
-    # send confirmation email
+    limited = rate_limit.check_email("/submit-designer", email)
+    if limited:
+        return limited
+
+    # saved with its confirmation email (sent by the outbox worker) in the next group commit
     try:
-        send_designer_confirmation(name=name, email=email)
-    except Exception as e:
-        print("Email error:", e)
+        await write_queue.submit("designer", {
+            "full_name": name,
+            "email": email,
+            "availability": [availability],
+            "interest_areas": experience_interests or [],
+            "niche_interest": niche_interests or [],
+            "tools": tools_comfort or [],
+            "figma_experience": [figma_skill],
+        }, email=(email, *email_utils.designer_confirmation_email(name)))
+    except write_queue.WriteQueueFull:
+        return rate_limit.overloaded()
 
     return templates.TemplateResponse(
         "confirmation.html",
@@ -130,25 +139,22 @@ async def submit_founder(
     weekly_hours: str = Form(...),
     founder_support: str = Form(...)
 ):
-    # Convert multi-select lists → strings
-    help_str = ", ".join(design_help_needed or [])
-    niche_str = ", ".join(project_niche or [])
-
-    conn = sqlite3.connect(DATABASE)
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO founders (name, email, design_help_needed,
-                              project_niche, weekly_hours, founder_support)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (name, email, help_str, niche_str, weekly_hours, founder_support))
-    conn.commit()
-    conn.close()
-
-    # Send founder confirmation email
+    limited = rate_limit.check_email("/submit-founder", email)
+    if limited:
+        return limited
+
+    # saved with its confirmation email (sent by the outbox worker) in the next group commit
     try:
-        send_founder_confirmation(name=name, email=email)
-    except Exception as e:
-        print("Email error:", e)
+        await write_queue.submit("founder", {
+            "full_name": name,
+            "email": email,
+            "design_help": design_help_needed or [],
+            "niche": project_niche or [],
+            "estimated_hours": weekly_hours,
+            "support_level": [founder_support],
+        }, email=(email, *email_utils.founder_confirmation_email(name)))
+    except write_queue.WriteQueueFull:
+        return rate_limit.overloaded()
 
     return templates.TemplateResponse(
         "confirmation.html",
@@ -156,6 +162,195 @@ async def submit_founder(
     )
 
 
+# ------------------------------
+# ROUTES — Admin
+# ------------------------------
+
+def require_admin(key: str):
+    if key != ADMIN_KEY:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+def _next_after(items):
+    """Keyset cursor for the next page, or None on the last page."""
+    return items[-1]["id"] if len(items) == ADMIN_PAGE_SIZE else None
+
+
+def _cached_admin_page(request: Request, render):
+    """
+    Serve an admin page from the render cache while no profile / match
+    has been written since it was rendered.
+
+    - render: builds the TemplateResponse on a cache miss
+    - the ETag changes with the data version, so unchanged pages cost
+      browsers a single 304
+    """
+    version = database.get_data_version()
+    url = str(request.url)
+    etag = '"' + hashlib.sha1(f"{version}:{url}".encode()).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    key = (url, version)
+    body = admin_page_cache.get(key)
+    if body is None:
+        body = render().body
+        admin_page_cache.put(key, body)
+    return HTMLResponse(body, headers=headers)
+
+
+@app.get("/admin", response_class=HTMLResponse)
+def admin_home(request: Request, key: str = ""):
+    require_admin(key)
+    return admin_templates.TemplateResponse("admin/admin.html", {"request": request})
+
+
+@app.get("/admin/designers", response_class=HTMLResponse)
+def admin_designers(request: Request, key: str = "", after: int = 0):
+    require_admin(key)
+
+    def render():
+        designers = [database.format_designer(row) for row in database.get_designers_page(after, ADMIN_PAGE_SIZE)]
+        return admin_templates.TemplateResponse(
+            "admin/admin_designers.html",
+            {"request": request, "designers": designers, "next_after": _next_after(designers), "key": key}
+        )
+
+    return _cached_admin_page(request, render)
+
+
+@app.get("/admin/founders", response_class=HTMLResponse)
+def admin_founders(request: Request, key: str = "", after: int = 0):
+    require_admin(key)
+
+    def render():
+        founders = [database.format_founder(row) for row in database.get_founders_page(after, ADMIN_PAGE_SIZE)]
+        return admin_templates.TemplateResponse(
+            "admin/admin_founders.html",
+            {"request": request, "founders": founders, "next_after": _next_after(founders), "key": key}
+        )
+
+    return _cached_admin_page(request, render)
+
+
+@app.get("/admin/matches", response_class=HTMLResponse)
+def admin_matches(request: Request, key: str = "", after: int = 0):
+    require_admin(key)
+
+    def render():
+        founders = [database.format_founder(row) for row in database.get_founders_page(after, ADMIN_PAGE_SIZE)]
+        top = database_matches.get_top_designers_for_founders(
+            [f["id"] for f in founders], ADMIN_MATCHES_PER_FOUNDER
+        )
+        results = [
+            {
+                "founder": founder,
+                "matches": [{"designer": d, "score": score} for d, score in top[founder["id"]]],
+            }
+            for founder in founders
+        ]
+        return admin_templates.TemplateResponse(
+            "admin/admin_matches.html",
+            {"request": request, "results": results, "next_after": _next_after(founders), "key": key}
+        )
+
+    return _cached_admin_page(request, render)
+
+
+@app.get("/admin/founder/{founder_id}", response_class=HTMLResponse)
+def admin_founder(request: Request, founder_id: int, key: str = ""):
+    require_admin(key)
+
+    def render():
+        row = database.get_founder_by_id(founder_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Founder not found")
+
+        founder = database.format_founder(row)
+        matches = [
+            {"designer": d, "score": score, "breakdown": match_breakdown(founder, d)}
+            for d, score in database_matches.get_top_designers_for_founder(founder_id)
+        ]
+        history = database_matches.get_match_records(founder_email=founder["email"], limit=20)
+        return admin_templates.TemplateResponse(
+            "admin/admin_founder.html",
+            {"request": request, "founder": founder, "matches": matches, "history": history}
+        )
+
+    return _cached_admin_page(request, render)
+
+
+@app.get("/admin/search")
+def admin_search(
+    request: Request,
+    key: str = "",
+    kind: str = "designers",
+    q: str = "",
+    availability: list[str] = Query(None),
+    niche: list[str] = Query(None),
+    tools: list[str] = Query(None),
+    stage: list[str] = Query(None),
+    limit: int = ADMIN_PAGE_SIZE,
+    format: str = "html",
+):
+    """Full-text + faceted search over designers / founders, as a page or JSON."""
+    require_admin(key)
+    if kind not in database_search.SEARCH_FACETS:
+        raise HTTPException(status_code=404, detail="Unknown search")
+
+    selected = {"availability": availability, "niche": niche, "tools": tools, "stage": stage}
+    facets = {name: selected[name] or [] for name in database_search.SEARCH_FACETS[kind]}
+
+    if format == "json":
+        return database_search.search_profiles(kind, q, facets, limit)
+
+    def render():
+        found = database_search.search_profiles(kind, q, facets, limit)
+        return admin_templates.TemplateResponse(
+            "admin/admin_search.html",
+            {"request": request, "key": key, "kind": kind, "q": q, "selected": facets, **found}
+        )
+
+    return _cached_admin_page(request, render)
+
+
+@app.get("/admin/raw-matches")
+def admin_raw_matches(
+    key: str = "",
+    founder: str = None,
+    designer: str = None,
+    min_score: float = None,
+    since: str = None,
+    until: str = None,
+    limit: int = database_matches.MATCH_RECORDS_LIMIT,
+):
+    require_admin(key)
+    return database_matches.get_match_records(
+        founder_email=founder,
+        designer_email=designer,
+        min_score=min_score,
+        since=since,
+        until=until,
+        limit=min(limit, 1000),
+    )
+
+
+@app.get("/admin/export/{kind}")
+def admin_export(kind: str, key: str = "", format: str = "csv"):
+    """Full designers / founders / matches / top matches export, streamed as CSV or NDJSON."""
+    require_admin(key)
+    if kind not in exporter.EXPORTS or format not in exporter.EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+
+    return StreamingResponse(
+        exporter.export(kind, format),
+        media_type=exporter.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{kind}.{format}"'},
+    )
+
+
 # ------------------------------
 # Health Check (Render Needs This)
 # ------------------------------
@@ -164,3 +359,12 @@ async def submit_founder(
 def health():
     return {"status": "ok"}
 
+
+# ------------------------------
+# Metrics (Prometheus text format)
+# ------------------------------
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
@@ -1,5 +1,40 @@
 # database_matches.py
-from .database import get_connection, get_cursor, get_placeholder, USE_POSTGRES
+import argparse
+import os
+
+from .database import (
+    DESIGNER_COLUMNS,
+    FOUNDER_COLUMNS,
+    bump_data_version,
+    get_connection,
+    get_cursor,
+    get_placeholder,
+    USE_POSTGRES,
+    get_designer_by_id,
+    get_founder_by_id,
+    format_designer,
+    format_founder,
+    iter_designers,
+    iter_founders,
+    _iter_rows,
+)
+from .match import (
+    assign_matches,
+    designer_profile_from_row,
+    founder_profile_from_row,
+    get_designer_index,
+    score_profiles,
+)
+
+if USE_POSTGRES:
+    from psycopg2.extras import execute_values
+
+# how many designers to keep per founder in `top_matches`
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "5"))
+# pg_advisory_xact_lock key held while maintaining top_matches
+TOP_MATCHES_LOCK_ID = 4_207_118
+# default page size for match log queries
+MATCH_RECORDS_LIMIT = int(os.getenv("MATCH_RECORDS_LIMIT", "100"))
 
 
 # --------------------------
@@ -14,45 +49,454 @@ def save_match_record(founder_email: str, designer_email: str, score: float):
         INSERT INTO matches (founder_email, designer_email, score)
         VALUES ({placeholder}, {placeholder}, {placeholder})
     """, (founder_email, designer_email, score))
-    
+    bump_data_version(cur)
+
+    conn.commit()
+    conn.close()
+
+
+def save_match_records(records):
+    """
+    Bulk insert [(founder_email, designer_email, score), ...] into the
+    match log in one statement / transaction.
+    """
+    records = list(records)
+    if not records:
+        return
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+
+    if USE_POSTGRES:
+        execute_values(cur, """
+            INSERT INTO matches (founder_email, designer_email, score) VALUES %s
+        """, records, page_size=1000)
+    else:
+        cur.executemany("""
+            INSERT INTO matches (founder_email, designer_email, score)
+            VALUES (?, ?, ?)
+        """, records)
+    bump_data_version(cur)
+
     conn.commit()
     conn.close()
 
 
 # --------------------------
-# Read all match logs
+# Read match logs
 # --------------------------
+def _match_record(row):
+    if USE_POSTGRES:
+        return {
+            "founder": row["founder_email"],
+            "designer": row["designer_email"],
+            "score": float(row["score"]),
+            "id": row["id"],
+            "created_at": str(row["created_at"]) if row.get("created_at") else None
+        }
+    return {
+        "founder": row[1],
+        "designer": row[2],
+        "score": float(row[3]),
+        "id": row[0],
+        "created_at": str(row[4]) if len(row) > 4 and row[4] else None
+    }
+
+
+def iter_match_records(batch_size=None):
+    """Every match log entry, oldest first, streamed in batches."""
+    columns = ("id", "founder_email", "designer_email", "score", "created_at")
+    rows = _iter_rows(f"SELECT {', '.join(columns)} FROM matches ORDER BY id", batch_size=batch_size)
+    for row in rows:
+        yield _match_record(dict(zip(columns, row)) if USE_POSTGRES else row)
+
+
+def iter_top_matches(batch_size=None):
+    """
+    Every `top_matches` entry as (founder_dict, designer_dict, score),
+    founder by founder, best first, streamed in batches.
+    """
+    founder_columns = ("id",) + FOUNDER_COLUMNS + ("version",)
+    designer_columns = ("id",) + DESIGNER_COLUMNS + ("version",)
+    rows = _iter_rows(f"""
+        SELECT {', '.join('f.' + c for c in founder_columns)},
+               {', '.join('d.' + c for c in designer_columns)},
+               t.score
+        FROM top_matches t
+        JOIN founders f ON f.id = t.founder_id
+        JOIN designers d ON d.id = t.designer_id
+        ORDER BY t.founder_id, t.score DESC, t.designer_id
+    """, batch_size=batch_size)
+
+    split = len(founder_columns)
+    founder = None
+    for row in rows:
+        if founder is None or founder["id"] != row[0]:
+            founder = format_founder(row[:split])
+        yield founder, format_designer(row[split:-1]), float(row[-1])
+
+
 def get_all_match_records():
     conn = get_connection()
     cur = get_cursor(conn)
     cur.execute("SELECT * FROM matches ORDER BY created_at DESC")
-    
+    records = [_match_record(row) for row in cur.fetchall()]
+    conn.close()
+    return records
+
+
+def get_match_records(
+    founder_email: str = None,
+    designer_email: str = None,
+    min_score: float = None,
+    since: str = None,
+    until: str = None,
+    limit: int = MATCH_RECORDS_LIMIT,
+):
+    """
+    Newest match log entries matching every given filter, at most `limit`.
+
+    - since / until: timestamps comparable with created_at
+      (e.g. "2025-01-31" or "2025-01-31 12:00:00"); since is inclusive
+    """
+    placeholder = get_placeholder()
+    where = []
+    params = []
+
+    if founder_email:
+        where.append(f"founder_email = {placeholder}")
+        params.append(founder_email)
+    if designer_email:
+        where.append(f"designer_email = {placeholder}")
+        params.append(designer_email)
+    if min_score is not None:
+        where.append(f"score >= {placeholder}")
+        params.append(min_score)
+    if since:
+        where.append(f"created_at >= {placeholder}")
+        params.append(since)
+    if until:
+        where.append(f"created_at < {placeholder}")
+        params.append(until)
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+    cur.execute(f"""
+        SELECT * FROM matches
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY created_at DESC, id DESC
+        LIMIT {placeholder}
+    """, (*params, limit))
+    records = [_match_record(row) for row in cur.fetchall()]
+    conn.close()
+    return records
+
+
+# --------------------------
+# Persisted top-K per founder
+# --------------------------
+def _lock_top_matches(conn, cur):
+    """
+    Serialize top_matches maintenance for the current transaction, so the
+    read-count-insert-trim of concurrent writers can't interleave.
+    """
     if USE_POSTGRES:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (TOP_MATCHES_LOCK_ID,))
+    elif not conn.in_transaction:
+        cur.execute("BEGIN IMMEDIATE")
+
+
+def _write_founder_matches(cur, ranked):
+    """Replace founders' rows: {founder_id: [(DesignerProfile, score), ...]}."""
+    placeholder = get_placeholder()
+    cur.executemany(f"DELETE FROM top_matches WHERE founder_id = {placeholder}", [(f,) for f in ranked])
+    cur.executemany(f"""
+        INSERT INTO top_matches (founder_id, designer_id, score)
+        VALUES ({placeholder}, {placeholder}, {placeholder})
+    """, [
+        (founder_id, designer.id, score)
+        for founder_id, best in ranked.items()
+        for designer, score in best
+        if score > 0
+    ])
+
+
+def _founders_listing(cur, designer_id):
+    cur.execute(f"SELECT DISTINCT founder_id FROM top_matches WHERE designer_id = {get_placeholder()}", (designer_id,))
+    return {r["founder_id"] if USE_POSTGRES else r[0] for r in cur.fetchall()}
+
+
+def update_matches_for_founder(founder_id: int, k: int = MATCH_TOP_K):
+    """
+    Re-rank one founder against all designers (via the inverted index)
+    and replace their rows in `top_matches`.
+    """
+    row = get_founder_by_id(founder_id)
+    if row is None:
+        return
+
+    best = get_designer_index().top_k(founder_profile_from_row(row), k)
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+    try:
+        _lock_top_matches(conn, cur)
+        _write_founder_matches(cur, {founder_id: best})
+        bump_data_version(cur)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def update_matches_for_designer(designer_id: int, k: int = MATCH_TOP_K):
+    """
+    Score one new or updated designer against every founder and slot them
+    into each founder's top-K where they beat the current weakest entry.
+
+    Founders whose list already held this designer are re-ranked in full
+    (via the index): a lower score or dropping out frees a slot that the
+    real next-best designer must fill.
+    """
+    row = get_designer_by_id(designer_id)
+    if row is None:
+        return
+    designer = designer_profile_from_row(row)
+    # refreshed before taking the lock; includes this designer's new version
+    index = get_designer_index()
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+    try:
+        # scoring and ranking happen before taking the write lock, which is
+        # held only for the top_matches reads and writes. The index doesn't
+        # depend on top_matches, so founders listing this designer can be
+        # re-ranked up front; the list is checked again under the lock
+        listing = _founders_listing(cur, designer_id)
+        scores = {}
+        ranked = {}
+        for founder_row in iter_founders():
+            founder = founder_profile_from_row(founder_row)
+            score = score_profiles(founder, designer)
+            if score > 0:
+                scores[founder.id] = score
+            if founder.id in listing:
+                ranked[founder.id] = index.top_k(founder, k)
+
+        _lock_top_matches(conn, cur)
+
+        affected = _founders_listing(cur, designer_id)
+        for founder_id in affected - ranked.keys():
+            founder_row = get_founder_by_id(founder_id)
+            ranked[founder_id] = index.top_k(founder_profile_from_row(founder_row), k) if founder_row else []
+        cur.execute(f"DELETE FROM top_matches WHERE designer_id = {placeholder}", (designer_id,))
+        _write_founder_matches(cur, {founder_id: ranked[founder_id] for founder_id in affected})
+
+        # size + weakest entry of every other founder's list; weakest is the
+        # last one by (score DESC, designer_id), so ties go to older designers
+        cur.execute("""
+            SELECT founder_id, n, score, designer_id FROM (
+                SELECT founder_id, score, designer_id,
+                       COUNT(*) OVER (PARTITION BY founder_id) AS n,
+                       ROW_NUMBER() OVER (PARTITION BY founder_id ORDER BY score, designer_id DESC) AS r
+                FROM top_matches
+            ) w
+            WHERE r = 1
+        """)
+        rows = [tuple(r.values()) for r in cur.fetchall()] if USE_POSTGRES else cur.fetchall()
+        # scores are 4-decimal fractions; REAL may not round-trip them exactly
+        current = {f_id: (n, round(score, 4), -d_id) for f_id, n, score, d_id in rows}
+
+        inserts = []
+        full = []
+        for founder_id, score in scores.items():
+            if founder_id in affected:
+                continue
+            n, weakest_score, weakest_rank = current.get(founder_id, (0, None, None))
+            if n < k:
+                inserts.append((founder_id, designer_id, score))
+            elif (score, -designer_id) > (weakest_score, weakest_rank):
+                inserts.append((founder_id, designer_id, score))
+                full.append(founder_id)
+
+        if inserts:
+            cur.executemany(f"""
+                INSERT INTO top_matches (founder_id, designer_id, score)
+                VALUES ({placeholder}, {placeholder}, {placeholder})
+            """, inserts)
+
+        # drop whatever fell out of the top-K (ties go to the older designer)
+        for founder_id in full:
+            cur.execute(f"""
+                DELETE FROM top_matches
+                WHERE founder_id = {placeholder}
+                  AND designer_id NOT IN (
+                    SELECT designer_id FROM top_matches
+                    WHERE founder_id = {placeholder}
+                    ORDER BY score DESC, designer_id
+                    LIMIT {placeholder}
+                  )
+            """, (founder_id, founder_id, k))
+
+        if inserts or affected:
+            bump_data_version(cur)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def rebuild_top_matches(k: int = MATCH_TOP_K, founder_ids=None):
+    """
+    Recompute `top_matches` from scratch, for every founder or only for
+    `founder_ids` (e.g. a freshly imported cohort).
+    Only needed to backfill; new submissions are handled incrementally.
+    """
+    if founder_ids is not None:
+        founder_ids = set(founder_ids)
+
+    index = get_designer_index()
+    rows = []
+    for founder_row in iter_founders():
+        if founder_ids is not None and founder_row[0] not in founder_ids:
+            continue
+        founder = founder_profile_from_row(founder_row)
+        rows.extend(
+            (founder.id, designer.id, score)
+            for designer, score in index.top_k(founder, k)
+            if score > 0
+        )
+
+    replace_top_matches(founder_ids, rows)
+
+
+def replace_top_matches(founder_ids, rows):
+    """
+    Swap in new `top_matches` rows in one transaction.
+
+    - founder_ids: founders whose lists are replaced (None = every founder)
+    - rows: [(founder_id, designer_id, score), ...]
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+
+    if founder_ids is None:
+        cur.execute("DELETE FROM top_matches")
+    else:
+        cur.executemany(
+            f"DELETE FROM top_matches WHERE founder_id = {placeholder}",
+            [(founder_id,) for founder_id in founder_ids],
+        )
+    cur.executemany(f"""
+        INSERT INTO top_matches (founder_id, designer_id, score)
+        VALUES ({placeholder}, {placeholder}, {placeholder})
+    """, rows)
+    bump_data_version(cur)
+
+    conn.commit()
+    conn.close()
+
+
+def get_top_designers_for_founder(founder_id: int, limit: int = MATCH_TOP_K):
+    """
+    A founder's best designers from `top_matches`, best first.
+
+    - returns: [(designer_dict, score), ...]
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+
+    cur.execute(f"""
+        SELECT d.*, t.score AS match_score
+        FROM top_matches t
+        JOIN designers d ON d.id = t.designer_id
+        WHERE t.founder_id = {placeholder}
+        ORDER BY t.score DESC, t.designer_id
+        LIMIT {placeholder}
+    """, (founder_id, limit))
+
+    if USE_POSTGRES:
+        rows = [tuple(row.values()) for row in cur.fetchall()]
+    else:
         rows = cur.fetchall()
-        # Convert to list of dicts
-        records = [
-            {
-                "founder": row["founder_email"],
-                "designer": row["designer_email"],
-                "score": float(row["score"]),
-                "id": row["id"],
-                "created_at": str(row["created_at"]) if row.get("created_at") else None
-            }
-            for row in rows
-        ]
+
+    conn.close()
+    return [(format_designer(row[:-1]), float(row[-1])) for row in rows]
+
+
+def get_top_designers_for_founders(founder_ids, limit: int = MATCH_TOP_K):
+    """
+    get_top_designers_for_founder for a batch of founders in one query.
+
+    - returns: {founder_id: [(designer_dict, score), ...]}
+    """
+    founder_ids = list(founder_ids)
+    results = {founder_id: [] for founder_id in founder_ids}
+    if not founder_ids:
+        return results
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+
+    cur.execute(f"""
+        SELECT d.*, t.founder_id AS match_founder_id, t.score AS match_score
+        FROM top_matches t
+        JOIN designers d ON d.id = t.designer_id
+        WHERE t.founder_id IN ({', '.join([placeholder] * len(founder_ids))})
+        ORDER BY t.founder_id, t.score DESC, t.designer_id
+    """, founder_ids)
+
+    if USE_POSTGRES:
+        rows = [tuple(row.values()) for row in cur.fetchall()]
     else:
         rows = cur.fetchall()
-        # Convert tuples to dicts
-        records = [
-            {
-                "founder": row[1],
-                "designer": row[2],
-                "score": float(row[3]),
-                "id": row[0],
-                "created_at": str(row[4]) if len(row) > 4 and row[4] else None
-            }
-            for row in rows
-        ]
-    
     conn.close()
-    return records
+
+    for row in rows:
+        matches = results[row[-2]]
+        if len(matches) < limit:
+            matches.append((format_designer(row[:-2]), float(row[-1])))
+    return results
+
+
+# --------------------------
+# Global assignment
+# --------------------------
+def run_global_matching(capacity: int = 1):
+    """
+    Solve one global assignment over everyone (see match.assign_matches)
+    and log it to `matches` in a single bulk insert.
+
+    - capacity: founders each designer can take on
+    - returns: [(founder_dict, designer_dict, score), ...]
+    """
+    founders = [format_founder(row) for row in iter_founders()]
+    designers = [format_designer(row) for row in iter_designers()]
+
+    pairs = assign_matches(founders, designers, capacity)
+    save_match_records(
+        (founder["email"], designer["email"], score)
+        for founder, designer, score in pairs
+    )
+    return pairs
+
+
+if __name__ == "__main__":
+    # python -m backend.database_matches assign --capacity 2
+    parser = argparse.ArgumentParser(description="Match maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    assign = commands.add_parser("assign", help="global one-to-one / capacity matching into `matches`")
+    assign.add_argument("--capacity", type=int, default=1, help="founders per designer (default 1)")
+
+    commands.add_parser("rebuild-top", help="recompute the `top_matches` table")
+
+    args = parser.parse_args()
+    if args.command == "assign":
+        pairs = run_global_matching(args.capacity)
+        print(f"✅ Logged {len(pairs)} matches")
+    else:
+        rebuild_top_matches()
+        print("✅ Rebuilt top_matches")
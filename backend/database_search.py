@@ -0,0 +1,234 @@
+# database_search.py
+#
+# Admin search over designers / founders: full-text on name, notes,
+# portfolio and tags, plus facet filters on the tag tables.
+#
+#   - SQLite: an FTS5 table per profile table ({table}_fts, rowid = id),
+#     kept in sync by triggers; ranked with bm25
+#   - PostgreSQL: a GIN index on a tsvector expression over the same
+#     columns (no extra column to keep in sync); ranked with ts_rank
+#
+# Migration 006 builds both from SEARCH_DOCUMENTS; changing the documents
+# needs a new migration that rebuilds them.
+import os
+import re
+
+from .database import (
+    USE_POSTGRES,
+    format_designer,
+    format_founder,
+    get_connection,
+    get_placeholder,
+)
+
+# searchable document per table: field -> profile columns
+SEARCH_DOCUMENTS = {
+    "designers": {
+        "name": ("full_name", "email", "city_country"),
+        "notes": ("extra_notes", "resources"),
+        "portfolio": ("portfolio",),
+        "tags": ("focus", "niche_interest", "tools", "availability", "interest_areas", "goals"),
+    },
+    "founders": {
+        "name": ("full_name", "email", "project_name"),
+        "notes": ("extra_notes",),
+        "portfolio": ("website",),
+        "tags": ("design_help", "niche", "tools_used", "project_stage"),
+    },
+}
+# relative weight of each field in the ranking (name hits first)
+SEARCH_WEIGHTS = {"name": 10.0, "notes": 1.0, "portfolio": 2.0, "tags": 4.0}
+_PG_WEIGHTS = {"name": "A", "notes": "D", "portfolio": "C", "tags": "B"}
+
+# facet query parameter -> tag kind, per profile table
+SEARCH_FACETS = {
+    "designers": {"availability": "availability", "niche": "niche", "tools": "tool"},
+    "founders": {"niche": "niche", "tools": "tool", "stage": "stage"},
+}
+
+SEARCH_MAX_LIMIT = 200
+# matches counted exactly (and broken down per facet value); past this the
+# total shows as "N+" and facet values come without counts
+SEARCH_COUNT_LIMIT = int(os.getenv("SEARCH_COUNT_LIMIT", "1000"))
+
+
+def _concat(columns, prefix=""):
+    return " || ' ' || ".join(f"COALESCE({prefix}{column}, '')" for column in columns)
+
+
+def fts_document(table, prefix=""):
+    """SQLite: the FTS5 column values of one row, in SEARCH_DOCUMENTS order."""
+    return ", ".join(_concat(columns, prefix) for columns in SEARCH_DOCUMENTS[table].values())
+
+
+def pg_document(table):
+    """
+    PostgreSQL: the weighted tsvector of a row. The GIN index is built on
+    this exact expression, so queries must use it verbatim.
+    """
+    parts = [
+        f"setweight(to_tsvector('simple', REPLACE({_concat(columns)}, ',', ' ')), '{_PG_WEIGHTS[field]}')"
+        for field, columns in SEARCH_DOCUMENTS[table].items()
+    ]
+    return "(" + " || ".join(parts) + ")"
+
+
+def _terms(q):
+    return re.findall(r"\w+", (q or "").lower())
+
+
+def _match_query(terms):
+    """Every term must match, as a prefix ("fram" finds Framer)."""
+    if USE_POSTGRES:
+        return " & ".join(f"{term}:*" for term in terms)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _facet_tags(cur, table):
+    """Facet vocabulary: [(facet, tag id, value), ...] (a few dozen rows)."""
+    kinds = SEARCH_FACETS[table]
+    placeholder = get_placeholder()
+    cur.execute(f"""
+        SELECT kind, id, value FROM tags
+        WHERE kind IN ({', '.join([placeholder] * len(kinds))})
+        ORDER BY value
+    """, tuple(kinds.values()))
+    facet_of = {kind: name for name, kind in kinds.items()}
+    return [(facet_of[kind], tag_id, value) for kind, tag_id, value in cur.fetchall()]
+
+
+def _matching(table, terms, tag_filters):
+    """
+    (FROM, WHERE, params, id column) of the matching profiles. With terms
+    on SQLite the FROM is the FTS table (alias f), otherwise the profile
+    table (alias p). Facet filters are PK lookups on the id column.
+    """
+    owner = table[:-1]
+    placeholder = get_placeholder()
+    clauses, params = [], []
+
+    if terms and not USE_POSTGRES:
+        source, id_column = f"{table}_fts f", "f.rowid"
+        clauses.append(f"{table}_fts MATCH {placeholder}")
+        params.append(_match_query(terms))
+    else:
+        source, id_column = f"{table} p", "p.id"
+        if terms:
+            clauses.append(f"{pg_document(table)} @@ to_tsquery('simple', {placeholder})")
+            params.append(_match_query(terms))
+
+    # one of the values of every facet (tag ids already resolved). Without
+    # an FTS match to drive the query, the first facet's postings do
+    # (tag index); the rest are PK probes per candidate
+    for i, tag_ids in enumerate(tag_filters):
+        values = ", ".join([placeholder] * len(tag_ids))
+        if i == 0 and id_column == "p.id" and not terms:
+            clauses.append(f"p.id IN (SELECT ft.{owner}_id FROM {owner}_tags ft WHERE ft.tag_id IN ({values}))")
+        else:
+            clauses.append(f"""EXISTS (
+                SELECT 1 FROM {owner}_tags ft
+                WHERE ft.{owner}_id = {id_column} AND ft.tag_id IN ({values})
+            )""")
+        params += tag_ids
+
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return source, where, params, id_column
+
+
+def search_profiles(table, q="", facets=None, limit=50):
+    """
+    Designers / founders matching a free-text query and facet filters.
+
+    - table: "designers" or "founders"
+    - q: words matched (as prefixes) against name, notes, portfolio and tags;
+      all must match. Empty: every profile, oldest first.
+    - facets: {facet: [values]} from SEARCH_FACETS[table]; a profile needs
+      one of the values of every given facet
+    - returns: {"results": [formatted profiles], "total": n,
+                "total_exact": bool, "facets": {facet: [(value, count), ...]}}
+
+    Up to SEARCH_COUNT_LIMIT matches the total is exact, facet counts cover
+    every match and results are ranked (name hits first). Past it, the
+    total reads as "at least", counts are None and results come oldest
+    first: ranking / counting tens of thousands of profiles is what makes a
+    broad search slow.
+    """
+    terms = _terms(q)
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    owner = table[:-1]
+    placeholder = get_placeholder()
+    wanted = {name: {v.strip().lower() for v in values or [] if v and v.strip()}
+              for name, values in (facets or {}).items()}
+
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        vocabulary = _facet_tags(cur, table)
+        tag_filters = []
+        for name in SEARCH_FACETS[table]:
+            if wanted.get(name):
+                tag_ids = [tag_id for facet, tag_id, value in vocabulary if facet == name and value in wanted[name]]
+                if not tag_ids:
+                    # an unknown value matches nothing
+                    return {"results": [], "total": 0, "total_exact": True,
+                            "facets": {facet: [] for facet in SEARCH_FACETS[table]}}
+                tag_filters.append(tag_ids)
+
+        source, where, params, id_column = _matching(table, terms, tag_filters)
+
+        # total + tag counts over the matches, capped at SEARCH_COUNT_LIMIT + 1
+        # ids. CROSS JOIN keeps SQLite walking the matches and reading each
+        # one's handful of tags by PK, instead of scanning every tag row
+        cur.execute(f"""
+            WITH m AS (SELECT {id_column} AS id FROM {source} {where} LIMIT {SEARCH_COUNT_LIMIT + 1})
+            SELECT NULL, COUNT(*) FROM m
+            UNION ALL
+            SELECT ft.tag_id, COUNT(*) FROM m CROSS JOIN {owner}_tags ft
+            WHERE ft.{owner}_id = m.id
+            GROUP BY ft.tag_id
+        """, params)
+        counts = dict(cur.fetchall())
+        total = counts.pop(None)
+        exact = total <= SEARCH_COUNT_LIMIT
+
+        # ranking scores every match, so only rank a bounded match set;
+        # broader searches list in id order until narrowed down
+        if terms and exact and not USE_POSTGRES:
+            # bm25 with the per-field weights set by migration 006
+            cur.execute(f"""
+                SELECT p.* FROM {source} JOIN {table} p ON p.id = f.rowid {where}
+                ORDER BY f.rank LIMIT {placeholder}
+            """, (*params, limit))
+        elif terms and exact:
+            cur.execute(f"""
+                SELECT p.* FROM {source} {where}
+                ORDER BY ts_rank({pg_document(table)}, to_tsquery('simple', {placeholder})) DESC, p.id
+                LIMIT {placeholder}
+            """, (*params, params[0], limit))
+        elif terms and not USE_POSTGRES:
+            cur.execute(f"""
+                SELECT p.* FROM {source} JOIN {table} p ON p.id = f.rowid {where}
+                ORDER BY f.rowid LIMIT {placeholder}
+            """, (*params, limit))
+        else:
+            cur.execute(f"SELECT p.* FROM {source} {where} ORDER BY p.id LIMIT {placeholder}", (*params, limit))
+        rows = cur.fetchall()
+    finally:
+        conn.close()
+
+    facet_counts = {name: [] for name in SEARCH_FACETS[table]}
+    for facet, tag_id, value in vocabulary:
+        n = counts.get(tag_id, 0) if exact else None
+        if n != 0 or value in wanted.get(facet, ()):
+            facet_counts[facet].append((value, n))
+    if exact:
+        for values in facet_counts.values():
+            values.sort(key=lambda item: -item[1])
+
+    formatter = format_designer if table == "designers" else format_founder
+    return {
+        "results": [formatter(row) for row in rows],
+        "total": min(total, SEARCH_COUNT_LIMIT),
+        "total_exact": exact,
+        "facets": facet_counts,
+    }
@@ -0,0 +1,85 @@
+# database_tags.py
+#
+# Queries over the normalized tag tables (tags / designer_tags / founder_tags).
+# Rows are written by database.write_tags on every save.
+#
+# The tables serve filtering (admin search facets, tag lookups); match
+# scoring runs on match.DesignerIndex, whose in-memory postings beat the
+# equivalent SQL joins.
+from .database import (
+    get_connection,
+    get_cursor,
+    get_placeholder,
+    USE_POSTGRES,
+    format_designer,
+    format_founder,
+    write_tags,
+)
+
+def _fetch_rows(cur):
+    if USE_POSTGRES:
+        return [tuple(row.values()) for row in cur.fetchall()]
+    return cur.fetchall()
+
+
+# --------------------------
+# Backfill
+# --------------------------
+def backfill_tags(cur=None):
+    """
+    Write tag rows for every designer / founder that has none yet.
+    With `cur`, runs inside the caller's transaction (no commit).
+    Returns the number of profiles backfilled.
+    """
+    conn = None
+    if cur is None:
+        conn = get_connection()
+        cur = get_cursor(conn)
+    done = 0
+
+    for owner, table, formatter in (
+        ("designer", "designers", format_designer),
+        ("founder", "founders", format_founder),
+    ):
+        cur.execute(f"""
+            SELECT * FROM {table} p
+            WHERE NOT EXISTS (SELECT 1 FROM {owner}_tags t WHERE t.{owner}_id = p.id)
+        """)
+        for row in _fetch_rows(cur):
+            profile = formatter(row)
+            write_tags(cur, owner, profile["id"], profile)
+            done += 1
+
+    if conn is not None:
+        conn.commit()
+        conn.close()
+    return done
+
+
+# --------------------------
+# Filtering
+# --------------------------
+def designer_ids_with_tags(kind: str, values):
+    """
+    Ids of designers tagged with any of `values` for one tag kind
+    (e.g. kind="tool", values=["framer"]).
+    """
+    values = [v.strip().lower() for v in values if v and v.strip()]
+    if not values:
+        return set()
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+
+    cur.execute(f"""
+        SELECT DISTINCT dt.designer_id
+        FROM tags t
+        JOIN designer_tags dt ON dt.tag_id = t.id
+        WHERE t.kind = {placeholder}
+          AND t.value IN ({', '.join([placeholder] * len(values))})
+    """, (kind, *values))
+    ids = {row[0] for row in _fetch_rows(cur)}
+
+    conn.close()
+    return ids
@@ -0,0 +1,189 @@
+# email_outbox.py
+#
+# Durable outbox for transactional emails. Routes enqueue a row and return;
+# a background worker sends due rows with retries + exponential backoff.
+
+import asyncio
+import os
+import time
+
+from . import email_utils
+from .database import get_connection, get_cursor, get_placeholder, USE_POSTGRES
+
+if USE_POSTGRES:
+    from psycopg2.extras import execute_values
+
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "2"))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "6"))
+# first retry after BACKOFF_BASE seconds, doubling each attempt, capped at BACKOFF_MAX
+EMAIL_OUTBOX_BACKOFF_BASE = float(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE", "30"))
+EMAIL_OUTBOX_BACKOFF_MAX = float(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX", "3600"))
+# a row claimed by a worker that died mid-send becomes due again after this
+EMAIL_OUTBOX_LEASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "120"))
+
+
+# --------------------------
+# Enqueue
+# --------------------------
+def insert_email(cur, to: str, subject: str, html: str):
+    """enqueue_email inside the caller's transaction. Returns the outbox row id."""
+    placeholder = get_placeholder()
+    cur.execute(f"""
+        INSERT INTO email_outbox (to_email, subject, html, next_attempt_at)
+        VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder})
+        {"RETURNING id" if USE_POSTGRES else ""}
+    """, (to, subject, html, time.time()))
+    return cur.fetchone()["id"] if USE_POSTGRES else cur.lastrowid
+
+
+def insert_emails(cur, emails):
+    """Bulk insert_email for [(to, subject, html), ...]."""
+    now = time.time()
+    rows = [(to, subject, html, now) for to, subject, html in emails]
+    if USE_POSTGRES:
+        execute_values(cur, """
+            INSERT INTO email_outbox (to_email, subject, html, next_attempt_at) VALUES %s
+        """, rows, page_size=1000)
+    else:
+        cur.executemany("""
+            INSERT INTO email_outbox (to_email, subject, html, next_attempt_at)
+            VALUES (?, ?, ?, ?)
+        """, rows)
+
+
+def enqueue_email(to: str, subject: str, html: str):
+    """
+    Store an email for the background worker. Returns the outbox row id.
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    outbox_id = insert_email(cur, to, subject, html)
+
+    conn.commit()
+    conn.close()
+    return outbox_id
+
+
+def enqueue_designer_confirmation(name: str, email: str):
+    subject, html = email_utils.designer_confirmation_email(name)
+    return enqueue_email(email, subject, html)
+
+
+def enqueue_founder_confirmation(name: str, email: str):
+    subject, html = email_utils.founder_confirmation_email(name)
+    return enqueue_email(email, subject, html)
+
+
+# --------------------------
+# Worker
+# --------------------------
+def _backoff(attempts: int) -> float:
+    return min(EMAIL_OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), EMAIL_OUTBOX_BACKOFF_MAX)
+
+
+def _claim_due(limit: int, now: float):
+    """
+    Claim up to `limit` due rows. Claiming pushes next_attempt_at out by the
+    lease, so concurrent workers (one per web process) never pick the same row.
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+
+    cur.execute(f"""
+        SELECT id, to_email, subject, html, attempts
+        FROM email_outbox
+        WHERE status IN ('pending', 'sending') AND next_attempt_at <= {placeholder}
+        ORDER BY next_attempt_at
+        LIMIT {placeholder}
+    """, (now, limit))
+    if USE_POSTGRES:
+        due = [(r["id"], r["to_email"], r["subject"], r["html"], r["attempts"]) for r in cur.fetchall()]
+    else:
+        due = cur.fetchall()
+
+    claimed = []
+    for outbox_id, to, subject, html, attempts in due:
+        cur.execute(f"""
+            UPDATE email_outbox
+            SET status = 'sending', attempts = attempts + 1, next_attempt_at = {placeholder}
+            WHERE id = {placeholder} AND status IN ('pending', 'sending') AND next_attempt_at <= {placeholder}
+        """, (now + EMAIL_OUTBOX_LEASE_SECONDS, outbox_id, now))
+        if cur.rowcount == 1:
+            claimed.append((outbox_id, to, subject, html, attempts + 1))
+
+    conn.commit()
+    conn.close()
+    return claimed
+
+
+def _mark_sent(outbox_id: int):
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+    cur.execute(f"""
+        UPDATE email_outbox
+        SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+        WHERE id = {placeholder}
+    """, (outbox_id,))
+    conn.commit()
+    conn.close()
+
+
+def _mark_failed(outbox_id: int, attempts: int, error: str):
+    """Reschedule with backoff, or give up after EMAIL_OUTBOX_MAX_ATTEMPTS."""
+    status = "failed" if attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS else "pending"
+
+    conn = get_connection()
+    cur = get_cursor(conn)
+    placeholder = get_placeholder()
+    cur.execute(f"""
+        UPDATE email_outbox
+        SET status = {placeholder}, next_attempt_at = {placeholder}, last_error = {placeholder}
+        WHERE id = {placeholder}
+    """, (status, time.time() + _backoff(attempts), error, outbox_id))
+    conn.commit()
+    conn.close()
+
+
+def process_outbox(limit: int = EMAIL_OUTBOX_BATCH_SIZE):
+    """
+    Send every due email once (blocking). Returns (sent, failed) counts.
+    """
+    sent = failed = 0
+    for outbox_id, to, subject, html, attempts in _claim_due(limit, time.time()):
+        try:
+            ok = email_utils.send_email(to=to, subject=subject, html=html) is not None
+            error = None if ok else "send_email returned no response"
+        except Exception as e:
+            ok, error = False, str(e)
+
+        if ok:
+            _mark_sent(outbox_id)
+            sent += 1
+        else:
+            _mark_failed(outbox_id, attempts, error)
+            failed += 1
+    return sent, failed
+
+
+async def run_outbox_worker():
+    """
+    Background loop for the web app: drain the outbox off the event loop,
+    then sleep EMAIL_OUTBOX_POLL_SECONDS when there's nothing left to send.
+    """
+    while True:
+        try:
+            sent, failed = await asyncio.to_thread(process_outbox)
+        except Exception as e:
+            print(f"❌ Email outbox worker error: {e}")
+            sent = failed = 0
+
+        if sent + failed < EMAIL_OUTBOX_BATCH_SIZE:
+            await asyncio.sleep(EMAIL_OUTBOX_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    # standalone worker: python -m backend.email_outbox
+    asyncio.run(run_outbox_worker())
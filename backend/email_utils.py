@@ -1,5 +1,12 @@
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
 
 
 # ----------------------------------------------------
@@ -7,6 +14,48 @@ import requests
 # ----------------------------------------------------
 RESEND_API_KEY = os.getenv("RESEND_API_KEY")
 FROM_EMAIL = os.getenv("FROM_EMAIL")  # Example: "playground@yourdomain.com"
+# Override to point at a local stand-in for Resend (tests / staging)
+RESEND_API_URL = os.getenv("RESEND_API_URL", "https://api.resend.com/emails")
+RESEND_BATCH_URL = os.getenv("RESEND_BATCH_URL", RESEND_API_URL.rstrip("/") + "/batch")
+RESEND_BATCH_SIZE = 100  # Resend accepts up to 100 emails per batch call
+
+# Bulk dispatch (send_match_emails)
+EMAIL_CONCURRENCY = int(os.getenv("EMAIL_CONCURRENCY", "4"))
+EMAIL_RATE_LIMIT = float(os.getenv("EMAIL_RATE_LIMIT", "2"))  # API requests per second
+
+
+# ----------------------------------------------------
+# HTTP SESSION (keep-alive, shared by every send)
+# ----------------------------------------------------
+_session = None
+_session_pool_size = 0
+_session_lock = threading.Lock()
+
+
+def _get_session(pool_size=EMAIL_CONCURRENCY):
+    """
+    The shared session, with keep-alive connections for at least
+    `pool_size` concurrent requests (the pool only ever grows).
+    """
+    global _session, _session_pool_size
+    pool_size = max(pool_size, 4)
+    if _session is None or _session_pool_size < pool_size:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+            if _session_pool_size < pool_size:
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+                _session.mount("https://", adapter)
+                _session.mount("http://", adapter)
+                _session_pool_size = pool_size
+    return _session
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {RESEND_API_KEY}",
+        "Content-Type": "application/json",
+    }
 
 
 def send_email(to: str, subject: str, html: str):
@@ -22,11 +71,8 @@ def send_email(to: str, subject: str, html: str):
         print("❌ Missing FROM_EMAIL. Check Render environment variables.")
         return None
 
-    url = "https://api.resend.com/emails"
-    headers = {
-        "Authorization": f"Bearer {RESEND_API_KEY}",
-        "Content-Type": "application/json",
-    }
+    url = RESEND_API_URL
+    headers = _headers()
 
     data = {
         "from": FROM_EMAIL,
@@ -36,21 +82,27 @@ def send_email(to: str, subject: str, html: str):
     }
 
     try:
-        response = requests.post(url, json=data, headers=headers, timeout=10)
+        with metrics.stage("email"):
+            response = _get_session().post(url, json=data, headers=headers, timeout=10)
         print("📬 Resend Response:", response.status_code, response.text)
         if response.status_code == 200:
+            metrics.emails.inc("sent")
             return response
         else:
             print(f"❌ Resend API returned error: {response.status_code}")
+            metrics.emails.inc("failed")
             return None
     except requests.exceptions.Timeout:
         print("❌ Error sending email: Request timeout")
+        metrics.emails.inc("failed")
         return None
     except requests.exceptions.RequestException as e:
         print(f"❌ Error sending email: {e}")
+        metrics.emails.inc("failed")
         return None
     except Exception as e:
         print(f"❌ Unexpected error sending email: {e}")
+        metrics.emails.inc("failed")
         return None
 
 
@@ -67,9 +119,9 @@ def _format_niche(niche_value):
     return niche_value or "Not provided"
 
 
-def send_match_email_to_founder(founder, designer):
+def founder_match_email(founder, designer):
     """
-    Sends a match notification email to the founder.
+    Subject + HTML for the founder's match notification.
     """
     subject = "Your Creative Partner Awaits 🎉"
     founder_name = founder.get("full_name")
@@ -87,7 +139,14 @@ def send_match_email_to_founder(founder, designer):
     <br>
     <p>– The Playground Team</p>
     """
-    
+    return subject, html
+
+
+def send_match_email_to_founder(founder, designer):
+    """
+    Sends a match notification email to the founder.
+    """
+    subject, html = founder_match_email(founder, designer)
     send_email(
         to=founder.get("email"),
         subject=subject,
@@ -95,9 +154,9 @@ def send_match_email_to_founder(founder, designer):
     )
 
 
-def send_match_email_to_designer(designer, founder):
+def designer_match_email(designer, founder):
     """
-    Sends a match notification email to the designer.
+    Subject + HTML for the designer's match notification.
     """
     subject = "You've Been Matched! 🎨✨"
     designer_name = designer.get("full_name")
@@ -116,20 +175,164 @@ def send_match_email_to_designer(designer, founder):
     <br>
     <p>– The Playground Team</p>
     """
-    
+    return subject, html
+
+
+def send_match_email_to_designer(designer, founder):
+    """
+    Sends a match notification email to the designer.
+    """
+    subject, html = designer_match_email(designer, founder)
     send_email(
         to=designer.get("email"),
         subject=subject,
         html=html
     )
 
+# ----------------------------------------------------
+# BULK MATCH NOTIFICATIONS
+# ----------------------------------------------------
+
+class _RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart across all threads.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _post_json(url, payload, limiter):
+    """
+    One rate-limited POST. Returns (status_code, json_or_none, error_or_none).
+    """
+    limiter.wait()
+    try:
+        with metrics.stage("email"):
+            response = _get_session().post(url, json=payload, headers=_headers(), timeout=10)
+    except requests.exceptions.RequestException as e:
+        return None, None, str(e)
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+
+    if response.status_code != 200:
+        return response.status_code, body, f"Resend API returned {response.status_code}"
+    return response.status_code, body, None
+
+
+def _send_batch(messages, limiter):
+    payload = [
+        {"from": FROM_EMAIL, "to": m["to"], "subject": m["subject"], "html": m["html"]}
+        for m in messages
+    ]
+    status, body, error = _post_json(RESEND_BATCH_URL, payload, limiter)
+
+    ids = []
+    if error is None and isinstance(body, dict):
+        ids = [item.get("id") for item in body.get("data") or []]
+
+    return [
+        _result(m, status, error, ids[i] if i < len(ids) else None)
+        for i, m in enumerate(messages)
+    ]
+
+
+def _send_one(message, limiter):
+    payload = {"from": FROM_EMAIL, "to": message["to"], "subject": message["subject"], "html": message["html"]}
+    status, body, error = _post_json(RESEND_API_URL, payload, limiter)
+    email_id = body.get("id") if error is None and isinstance(body, dict) else None
+    return [_result(message, status, error, email_id)]
+
+
+def _result(message, status, error, email_id):
+    metrics.emails.inc("sent" if error is None else "failed")
+    return {
+        "to": message["to"],
+        "role": message["role"],
+        "founder_email": message["founder_email"],
+        "designer_email": message["designer_email"],
+        "ok": error is None,
+        "status": status,
+        "id": email_id,
+        "error": error,
+    }
+
+
+def send_match_emails(pairs, concurrency=EMAIL_CONCURRENCY, rate_limit=EMAIL_RATE_LIMIT, use_batch=True):
+    """
+    Notify both sides of many matches at once.
+
+    - pairs: [(founder_dict, designer_dict), ...]
+    - sends over one keep-alive session, at most `concurrency` requests in
+      flight and `rate_limit` requests per second; with use_batch, up to
+      RESEND_BATCH_SIZE emails go in each request to Resend's batch endpoint
+    - returns: one result dict per recipient, in input order
+      ({"to", "role", "founder_email", "designer_email", "ok", "status", "id", "error"})
+    """
+    messages = []
+    for founder, designer in pairs:
+        subject, html = founder_match_email(founder, designer)
+        messages.append({
+            "to": founder.get("email"), "role": "founder", "subject": subject, "html": html,
+            "founder_email": founder.get("email"), "designer_email": designer.get("email"),
+        })
+        subject, html = designer_match_email(designer, founder)
+        messages.append({
+            "to": designer.get("email"), "role": "designer", "subject": subject, "html": html,
+            "founder_email": founder.get("email"), "designer_email": designer.get("email"),
+        })
+
+    if not messages:
+        return []
+
+    if not RESEND_API_KEY or not FROM_EMAIL:
+        print("❌ Missing RESEND_API_KEY / FROM_EMAIL. Check Render environment variables.")
+        return [_result(m, None, "email not configured", None) for m in messages]
+
+    limiter = _RateLimiter(rate_limit)
+    if use_batch:
+        chunks = [messages[i:i + RESEND_BATCH_SIZE] for i in range(0, len(messages), RESEND_BATCH_SIZE)]
+        send = _send_batch
+    else:
+        chunks = messages
+        send = _send_one
+
+    concurrency = max(1, concurrency)
+    # one pooled connection per worker, or requests past the pool size
+    # open (and drop) a fresh connection each time
+    _get_session(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = []
+        for chunk_results in pool.map(lambda chunk: send(chunk, limiter), chunks):
+            results.extend(chunk_results)
+
+    sent = sum(1 for r in results if r["ok"])
+    print(f"📬 Match emails: {sent}/{len(results)} sent")
+    return results
+
+
 # ----------------------------------------------------
 # SIMPLE CONFIRMATION EMAILS (forms submitted)
 # ----------------------------------------------------
 
-def send_designer_confirmation(name: str, email: str):
+def designer_confirmation_email(name: str):
     """
-    Email the designer a simple confirmation after they submit the form.
+    Subject + HTML for the designer confirmation email.
     """
     subject = "You're in the designer playground 🎠"
 
@@ -143,13 +346,20 @@ def send_designer_confirmation(name: str, email: str):
     <br>
     <p style="opacity:0.7;">– The Playground Team</p>
     """
+    return subject, html
 
+
+def send_designer_confirmation(name: str, email: str):
+    """
+    Email the designer a simple confirmation after they submit the form.
+    """
+    subject, html = designer_confirmation_email(name)
     send_email(to=email, subject=subject, html=html)
 
 
-def send_founder_confirmation(name: str, email: str):
+def founder_confirmation_email(name: str):
     """
-    Email the founder a simple confirmation after they submit the form.
+    Subject + HTML for the founder confirmation email.
     """
     subject = "You’re in – we’re finding your designer 🧱"
 
@@ -163,6 +373,12 @@ def send_founder_confirmation(name: str, email: str):
     <br>
     <p style="opacity:0.7;">– The Playground Team</p>
     """
+    return subject, html
 
-    send_email(to=email, subject=subject, html=html)
 
+def send_founder_confirmation(name: str, email: str):
+    """
+    Email the founder a simple confirmation after they submit the form.
+    """
+    subject, html = founder_confirmation_email(name)
+    send_email(to=email, subject=subject, html=html)
@@ -0,0 +1,137 @@
+# exporter.py
+#
+# Streaming CSV / NDJSON exports of designers, founders, the match log and
+# the current top matches (with their score breakdown).
+# Rows are read in DB_ITER_BATCH_SIZE batches and written out in chunks, so
+# memory stays flat whatever the table size.
+#
+#   python -m backend.exporter designers --format csv --out designers.csv
+#   python -m backend.exporter matches --format ndjson > matches.ndjson
+#
+# The same generators back the /admin/export/{kind} endpoints.
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+from .database import (
+    DESIGNER_COLUMNS,
+    FOUNDER_COLUMNS,
+    format_designer,
+    format_founder,
+    iter_designers,
+    iter_founders,
+)
+from .database_matches import iter_match_records, iter_top_matches
+from .match import SCORE_FACTORS, match_breakdown
+
+# records per chunk handed to the client / file
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "500"))
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _top_match_records():
+    # per-factor points come from the breakdown memo when the pair was
+    # already looked at (admin drill-down, earlier export)
+    for founder, designer, score in iter_top_matches():
+        record = {
+            "founder_id": founder["id"],
+            "founder": founder["email"],
+            "designer_id": designer["id"],
+            "designer": designer["email"],
+            "score": score,
+        }
+        parts = match_breakdown(founder, designer)
+        for factor in SCORE_FACTORS:
+            record[factor] = parts[factor]
+        yield record
+
+
+# kind -> (fieldnames, record generator)
+EXPORTS = {
+    "designers": (
+        ("id",) + DESIGNER_COLUMNS,
+        lambda: (format_designer(row) for row in iter_designers()),
+    ),
+    "founders": (
+        ("id",) + FOUNDER_COLUMNS,
+        lambda: (format_founder(row) for row in iter_founders()),
+    ),
+    "matches": (
+        ("id", "founder", "designer", "score", "created_at"),
+        iter_match_records,
+    ),
+    "top_matches": (
+        ("founder_id", "founder", "designer_id", "designer", "score") + SCORE_FACTORS,
+        _top_match_records,
+    ),
+}
+
+
+def _csv_value(value):
+    # multi-select fields round-trip through the importer as comma lists
+    if isinstance(value, list):
+        return ",".join(value)
+    return "" if value is None else value
+
+
+def stream_csv(records, fieldnames, chunk_rows=EXPORT_CHUNK_ROWS):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fieldnames)
+
+    for n, record in enumerate(records, start=1):
+        writer.writerow([_csv_value(record.get(field)) for field in fieldnames])
+        if n % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(records, fieldnames, chunk_rows=EXPORT_CHUNK_ROWS):
+    lines = []
+    for record in records:
+        lines.append(json.dumps({field: record.get(field) for field in fieldnames}))
+        if len(lines) >= chunk_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def export(kind, fmt="csv"):
+    """
+    Text chunks of a full export.
+
+    - kind: "designers", "founders", "matches" or "top_matches"
+    - fmt: "csv" or "ndjson"
+    """
+    if kind not in EXPORTS:
+        raise ValueError(f"unknown export: {kind}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown format: {fmt}")
+
+    fieldnames, records = EXPORTS[kind]
+    stream = stream_csv if fmt == "csv" else stream_ndjson
+    return stream(records(), fieldnames)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export designers / founders / match log")
+    parser.add_argument("kind", choices=list(EXPORTS))
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--out", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for chunk in export(args.kind, args.format):
+            out.write(chunk)
+    finally:
+        if args.out:
+            out.close()
+            print(f"✅ Exported {args.kind} to {args.out}", file=sys.stderr)
@@ -0,0 +1,242 @@
+# importer.py
+#
+# Bulk import of designer / founder cohorts from CSV or JSONL.
+#
+#   python -m backend.importer designers cohort.csv
+#   python -m backend.importer founders cohort.jsonl --rejects rejects.jsonl
+#
+# Column / key names are the database field names (see DESIGNER_COLUMNS /
+# FOUNDER_COLUMNS). Multi-select cells may be lists (JSONL) or comma /
+# semicolon separated strings (CSV). Rows are normalized exactly like
+# save_designer / save_founder (an email already on file updates that
+# profile), then written IMPORT_CHUNK_SIZE at a time:
+# one transaction per chunk, executemany on SQLite, execute_values on
+# PostgreSQL. Rows that fail validation or the insert are reported, not fatal.
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from .database import (
+    get_connection,
+    get_cursor,
+    DESIGNER_COLUMNS,
+    FOUNDER_COLUMNS,
+    bump_data_version,
+    upsert_profile,
+    upsert_profiles,
+)
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+
+# fields designer_params / founder_params expect as lists
+_LIST_FIELDS = {
+    "designer": {
+        "availability", "focus", "interest_areas", "unpaid_experience", "goals",
+        "niche_interest", "tools", "figma_experience", "resources",
+    },
+    "founder": {"project_stage", "design_help", "paid_role", "niche", "support_level"},
+}
+
+_COLUMNS = {"designer": DESIGNER_COLUMNS, "founder": FOUNDER_COLUMNS}
+
+_SPLIT = re.compile(r"[;,]")
+
+
+class RejectedRow(ValueError):
+    """A source row that cannot be imported."""
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            # header is line 1
+            yield reader.line_num, record
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, RejectedRow(f"invalid JSON: {e}")
+                continue
+            yield line_no, record
+
+
+def read_records(path, fmt=None):
+    """
+    Stream (line_no, record_dict) from a CSV or JSONL file. Unparseable
+    lines come through as (line_no, RejectedRow).
+    """
+    fmt = fmt or ("csv" if Path(path).suffix.lower() == ".csv" else "jsonl")
+    return _read_csv(path) if fmt == "csv" else _read_jsonl(path)
+
+
+# -----------------------------
+# Normalization
+# -----------------------------
+def normalize_record(owner, record):
+    """
+    Source record -> save_designer / save_founder style dict.
+    Raises RejectedRow when the record is unusable.
+    """
+    if isinstance(record, RejectedRow):
+        raise record
+    if not isinstance(record, dict):
+        raise RejectedRow("record is not an object")
+    if None in record:
+        raise RejectedRow("more cells than header columns")
+
+    list_fields = _LIST_FIELDS[owner]
+    columns = _COLUMNS[owner]
+    data = {}
+    for key in columns:
+        value = record.get(key)
+        if value is None:
+            continue
+        if key in list_fields:
+            items = value if isinstance(value, list) else _SPLIT.split(str(value))
+            data[key] = [str(item).strip() for item in items if str(item).strip()]
+        elif isinstance(value, list):
+            data[key] = ",".join(str(item).strip() for item in value)
+        else:
+            data[key] = str(value).strip()
+
+    if not data.get("full_name"):
+        raise RejectedRow("missing full_name")
+    email = data.get("email", "")
+    if "@" not in email:
+        raise RejectedRow(f"invalid email: {email!r}")
+    return data
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+def _insert_chunk(cur, owner, chunk):
+    """Insert [(line_no, data), ...]; returns the new ids in the same order."""
+    ids = upsert_profiles(cur, owner, [data for _, data in chunk])
+    bump_data_version(cur)
+    return ids
+
+
+def _insert_one(cur, owner, data):
+    new_id = upsert_profile(cur, owner, data)
+    bump_data_version(cur)
+    return new_id
+
+
+def _write_chunk(owner, chunk, rejects):
+    """
+    One transaction for the whole chunk; if it fails, retry row by row so
+    only the offending rows are rejected. Returns the new ids.
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    try:
+        try:
+            ids = _insert_chunk(cur, owner, chunk)
+            conn.commit()
+            return ids
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Chunk insert failed ({e}); retrying {len(chunk)} rows one by one")
+
+        ids = []
+        for line_no, data in chunk:
+            try:
+                ids.append(_insert_one(cur, owner, data))
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                rejects.append({"line": line_no, "error": str(e), "record": data})
+        return ids
+    finally:
+        conn.close()
+
+
+def import_file(owner, path, fmt=None, chunk_size=IMPORT_CHUNK_SIZE, rematch=False):
+    """
+    Import designers (owner="designer") or founders (owner="founder") from
+    a CSV / JSONL file.
+
+    - rematch: refresh `top_matches` once at the end: for the new founders
+      only, or for every founder after a designer import. Off by default,
+      since scoring dwarfs the load itself on large cohorts
+    - returns: (imported_ids, rejects) with rejects as
+      [{"line", "error", "record"}, ...]
+    """
+    return import_records(owner, read_records(path, fmt), chunk_size, rematch)
+
+
+def import_records(owner, records, chunk_size=IMPORT_CHUNK_SIZE, rematch=False):
+    """import_file for any stream of (line_no, record_dict)."""
+    imported = []
+    rejects = []
+    chunk = []
+
+    for line_no, record in records:
+        try:
+            chunk.append((line_no, normalize_record(owner, record)))
+        except RejectedRow as e:
+            if isinstance(record, RejectedRow):
+                record = None
+            rejects.append({"line": line_no, "error": str(e), "record": record})
+            continue
+
+        if len(chunk) >= chunk_size:
+            imported += _write_chunk(owner, chunk, rejects)
+            chunk = []
+            print(f"… {len(imported)} {owner}s imported")
+
+    if chunk:
+        imported += _write_chunk(owner, chunk, rejects)
+
+    if rematch and imported:
+        from .database_matches import rebuild_top_matches
+        rebuild_top_matches(founder_ids=imported if owner == "founder" else None)
+
+    return imported, rejects
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import designers / founders")
+    parser.add_argument("kind", choices=["designers", "founders"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    parser.add_argument("--rejects", type=Path, help="write rejected rows here as JSONL")
+    parser.add_argument("--rematch", action="store_true", help="refresh top_matches after the import")
+    args = parser.parse_args()
+
+    from .database import init_db
+    init_db()
+
+    imported, rejects = import_file(
+        args.kind[:-1], args.path, args.format, args.chunk_size, rematch=args.rematch
+    )
+    print(f"✅ Imported {len(imported)} {args.kind}")
+    if imported and not args.rematch:
+        print("   top_matches not refreshed; run: python -m backend.database_matches rebuild-top")
+
+    if rejects:
+        print(f"❌ Rejected {len(rejects)} rows")
+        for reject in rejects[:20]:
+            print(f"   line {reject['line']}: {reject['error']}")
+        if args.rejects:
+            with open(args.rejects, "w", encoding="utf-8") as f:
+                for reject in rejects:
+                    f.write(json.dumps(reject) + "\n")
+            print(f"   all rejects written to {args.rejects}")
+        sys.exit(1)
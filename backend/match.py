@@ -1,9 +1,30 @@
 # match.py
 
+import heapq
+import re
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python scoring below
+    np = None
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # required by assign_matches only (see requirements.txt)
+    linear_sum_assignment = None
+
+from . import profile_cache
 from .database import (
-    get_all_designers,
+    get_designer_by_id,
+    get_designer_versions,
+    get_designers_after,
+    get_designers_state,
+    iter_designers,
     format_designer,
-    format_founder,
 )
 
 # -----------------------------
@@ -28,6 +49,9 @@ def _norm_list(value):
     return [v.strip().lower() for v in str(value).split(",") if v]
 
 
+_HOURS_DIGITS = re.compile(r"\d+")
+
+
 def _parse_hours(raw):
     """
     Very forgiving parser for things like:
@@ -36,14 +60,16 @@ def _parse_hours(raw):
     """
     if not raw:
         return None
+    return _parse_hours_text(str(raw))
+
 
-    text = str(raw)
+@lru_cache(maxsize=1024)
+def _parse_hours_text(text):
     # replace en-dash etc with hyphen
     text = text.replace("–", "-").lower()
 
     # extract digits
-    import re
-    nums = re.findall(r"\d+", text)
+    nums = _HOURS_DIGITS.findall(text)
     if not nums:
         return None
 
@@ -69,11 +95,287 @@ def _bucket_hours(h):
     return "heavy"
 
 
+def _hours_points(founder_bucket, designer_availability):
+    """
+    Points (0-3) for how well a designer's availability fits the
+    founder's expected intensity.
+
+    We treat:
+      - more availability options = more flexible
+      - heavy hours + no availability = bad
+      - light hours + any availability = fine
+    """
+    if founder_bucket is None:
+        # no hours info; give a small neutral bump if designer is broadly available
+        if len(designer_availability) >= 2:
+            return 1
+        return 0
+
+    # we have some expected intensity
+    if founder_bucket == "light":
+        # any availability is okay
+        if designer_availability:
+            return 2
+    elif founder_bucket == "medium":
+        # needs at least some flexibility
+        if len(designer_availability) >= 2:
+            return 2
+        elif designer_availability:
+            return 1
+    elif founder_bucket == "heavy":
+        # prefers very available designers
+        if "flexible" in designer_availability:
+            return 3
+        elif len(designer_availability) >= 2:
+            return 2
+    return 0
+
+
+# -----------------------------
+# compact profiles
+# -----------------------------
+
+# Niche / skill / tool tokens are interned to small integer ids shared by
+# every profile in the process, so a profile's tags are one int bitset per
+# factor and an overlap is `&` + popcount. The tables only ever grow.
+NICHE, SKILL, TOOL = 0, 1, 2
+_TAG_IDS = ({}, {}, {})
+_tag_lock = threading.Lock()
+
+# index into the per-designer hours points tuple
+_BUCKET_INDEX = {None: 0, "light": 1, "medium": 2, "heavy": 3}
+
+# the few distinct per-bucket points tuples, shared between designers
+_EXTRA_POINTS = {}
+
+
+def _tag_mask(tokens, factor):
+    ids = _TAG_IDS[factor]
+    mask = 0
+    for token in tokens:
+        bit = ids.get(token)
+        if bit is None:
+            with _tag_lock:
+                bit = ids.setdefault(token, len(ids))
+        mask |= 1 << bit
+    return mask
+
+
+def _tag_bits(mask):
+    """Interned ids set in a tag bitset."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class FounderProfile:
+    """
+    Everything the scorer needs from a founder: tag bitsets
+    (niche / needs / tools) and the _BUCKET_INDEX of their hours.
+    """
+    __slots__ = ("id", "email", "niche", "needs", "tools", "bucket")
+
+    def __init__(self, id, email, niche, needs, tools, bucket):
+        self.id = id
+        self.email = email
+        self.niche = niche
+        self.needs = needs
+        self.tools = tools
+        self.bucket = bucket
+
+
+class DesignerProfile:
+    """
+    Everything the scorer needs from a designer: tag bitsets
+    (niche / focus / tools), `extra`, the hours + info points they
+    earn against each founder hours bucket, and the info points alone.
+    """
+    __slots__ = ("id", "email", "niche", "focus", "tools", "extra", "info")
+
+    def __init__(self, id, email, niche, focus, tools, extra, info):
+        self.id = id
+        self.email = email
+        self.niche = niche
+        self.focus = focus
+        self.tools = tools
+        self.extra = extra
+        self.info = info
+
+
+def _founder(founder_id, email, niche, design_help, tools_used, estimated_hours):
+    return FounderProfile(
+        founder_id,
+        email,
+        _tag_mask(_norm_list(niche), NICHE),
+        _tag_mask(_norm_list(design_help), SKILL),
+        _tag_mask(_norm_list(tools_used), TOOL),
+        # Founder: estimated_hours (string like "3–5 hours a week")
+        _BUCKET_INDEX[_bucket_hours(_parse_hours(estimated_hours))],
+    )
+
+
+def _designer(designer_id, email, niche_interest, focus, tools, availability, goals):
+    niches = _norm_list(niche_interest)
+
+    # Encourages designers who put in more info (niche / goals filled)
+    info_rich = 0
+    if niches:
+        info_rich += 1
+    if _norm_list(goals):
+        info_rich += 1
+
+    # Designer: currently only has "availability" (Weekdays / Weekends / Evenings / Flexible)
+    # kept as a list: the hours rule counts entries, duplicates included
+    availability = _norm_list(availability)
+    extra = tuple(_hours_points(bucket, availability) + info_rich for bucket in _BUCKET_INDEX)
+
+    return DesignerProfile(
+        designer_id,
+        email,
+        _tag_mask(niches, NICHE),
+        _tag_mask(_norm_list(focus), SKILL),
+        _tag_mask(_norm_list(tools), TOOL),
+        _EXTRA_POINTS.setdefault(extra, extra),
+        info_rich,
+    )
+
+
+def build_founder_profile(founder: dict) -> FounderProfile:
+    return _founder(
+        founder.get("id"), founder.get("email"),
+        founder.get("niche"), founder.get("design_help"),
+        founder.get("tools_used"), founder.get("estimated_hours"),
+    )
+
+
+def build_designer_profile(designer: dict) -> DesignerProfile:
+    return _designer(
+        designer.get("id"), designer.get("email"),
+        designer.get("niche_interest"), designer.get("focus"),
+        designer.get("tools"), designer.get("availability"), designer.get("goals"),
+    )
+
+
+def founder_profile_from_row(row) -> FounderProfile:
+    """build_founder_profile straight from a `founders` row, no dict in between."""
+    return _founder(row[0], row[2], row[9], row[6], row[7], row[10])
+
+
+def designer_profile_from_row(row) -> DesignerProfile:
+    """build_designer_profile straight from a `designers` row, no dict in between."""
+    return _designer(row[0], row[2], row[10], row[6], row[11], row[5], row[9])
+
+
+def _cached(cache, source, build):
+    key = (source.get("id"), source.get("version"))
+    if None in key:
+        return build(source)
+    profile = cache.get(key)
+    if profile is None:
+        profile = build(source)
+        cache.put(key, profile)
+    return profile
+
+
+def founder_profile(founder: dict) -> FounderProfile:
+    """
+    Cached build_founder_profile, keyed by founder id + version.
+    """
+    return _cached(profile_cache.founder_profiles, founder, build_founder_profile)
+
+
+def designer_profile(designer: dict) -> DesignerProfile:
+    """
+    Cached build_designer_profile, keyed by designer id + version.
+    """
+    return _cached(profile_cache.designer_profiles, designer, build_designer_profile)
+
+
 # -----------------------------
 # core scoring
 # -----------------------------
 
-def compute_match_score(founder: dict, designer: dict) -> float:
+# 4 (niche) + 3 (skills) + 3 (tools) + 3 (hours) + 2 (info bonus)
+MAX_RAW_SCORE = 15
+
+# normalized score for every possible raw score
+_NORMALIZED = [round(points / MAX_RAW_SCORE, 4) for points in range(MAX_RAW_SCORE + 1)]
+
+
+def score_profiles(founder: FounderProfile, designer: DesignerProfile) -> float:
+    """
+    compute_match_score on compact profiles.
+    """
+    score = 0
+
+    # ---------- 1) Niche overlap (strongest signal) ----------
+    # up to 4 points
+    score += min((founder.niche & designer.niche).bit_count(), 4)
+
+    # ---------- 2) Skills / design focus vs needs ----------
+    # up to 3 points
+    score += min((founder.needs & designer.focus).bit_count(), 3)
+
+    # ---------- 3) Tools overlap ----------
+    # up to 3 points
+    score += min((founder.tools & designer.tools).bit_count(), 3)
+
+    # ---------- 4) Hours & availability fit ----------
+    # up to 3 points
+    # ---------- 5) Small bonus: designer actually filled niche / goals ----------
+    # up to +2
+    score += designer.extra[founder.bucket]
+
+    # ---------- final normalization ----------
+    return _NORMALIZED[score]
+
+
+# score_breakdown components, in display order
+SCORE_FACTORS = ("niche", "skills", "tools", "hours", "info_bonus")
+
+
+def score_breakdown(founder: FounderProfile, designer: DesignerProfile) -> dict:
+    """
+    score_profiles, factor by factor: points per SCORE_FACTORS entry plus
+    the raw "points" total and the normalized "score".
+    """
+    info = designer.info
+    parts = {
+        "niche": min((founder.niche & designer.niche).bit_count(), 4),
+        "skills": min((founder.needs & designer.focus).bit_count(), 3),
+        "tools": min((founder.tools & designer.tools).bit_count(), 3),
+        "hours": designer.extra[founder.bucket] - info,
+        "info_bonus": info,
+    }
+    points = sum(parts.values())
+    parts["points"] = points
+    parts["score"] = _NORMALIZED[points]
+    return parts
+
+
+def _score_dicts(founder: dict, designer: dict) -> float:
+    """
+    compute_match_score for dicts that can't be cached (no id / version):
+    plain set overlaps, cheaper than building two bitset profiles for a
+    single score.
+    """
+    designer_niches = _norm_list(designer.get("niche_interest"))
+    points = (
+        min(len(set(_norm_list(founder.get("niche"))) & set(designer_niches)), 4)
+        + min(len(set(_norm_list(founder.get("design_help"))) & set(_norm_list(designer.get("focus")))), 3)
+        + min(len(set(_norm_list(founder.get("tools_used"))) & set(_norm_list(designer.get("tools")))), 3)
+        + _hours_points(
+            _bucket_hours(_parse_hours(founder.get("estimated_hours"))),
+            _norm_list(designer.get("availability")),
+        )
+        + bool(designer_niches)
+        + bool(_norm_list(designer.get("goals")))
+    )
+    return _NORMALIZED[points]
+
+
+def compute_match_score(founder: dict, designer: dict, breakdown: bool = False):
     """
     Returns a number between 0 and 1:
       0   = terrible / no overlap
@@ -84,127 +386,377 @@ def compute_match_score(founder: dict, designer: dict) -> float:
       - Design focus vs design help (skills)
       - Tools used
       - Availability + hours
+
+    With breakdown=True, returns the score_breakdown dict instead.
     """
-    score = 0.0
-    max_score = 0.0
+    if not breakdown and None in (founder.get("id"), founder.get("version"), designer.get("id"), designer.get("version")):
+        return _score_dicts(founder, designer)
 
-    # ---------- 1) Niche overlap (strongest signal) ----------
-    founder_niches = _norm_list(founder.get("niche"))
-    designer_niches = _norm_list(designer.get("niche_interest"))
+    f, d = founder_profile(founder), designer_profile(designer)
+    if breakdown:
+        return score_breakdown(f, d)
+    return score_profiles(f, d)
 
-    # up to 4 points
-    max_score += 4
-    if founder_niches and designer_niches:
-        overlap = len(set(founder_niches) & set(designer_niches))
-        # cap at 4
-        score += min(overlap, 4)
 
-    # ---------- 2) Skills / design focus vs needs ----------
-    founder_needs = _norm_list(founder.get("design_help"))
-    designer_focus = _norm_list(designer.get("focus"))
+def match_breakdown(founder: dict, designer: dict) -> dict:
+    """
+    score_breakdown for two formatted profiles, memoized per
+    (founder id + version, designer id + version): a re-submitted profile
+    gets a new version, so stale entries are simply never hit again.
+    """
+    key = (founder.get("id"), founder.get("version"), designer.get("id"), designer.get("version"))
+    if None in key:
+        return score_breakdown(build_founder_profile(founder), build_designer_profile(designer))
 
-    # up to 3 points
-    max_score += 3
-    if founder_needs and designer_focus:
-        overlap = len(set(founder_needs) & set(designer_focus))
-        score += min(overlap, 3)
+    parts = profile_cache.score_breakdowns.get(key)
+    if parts is None:
+        parts = score_breakdown(build_founder_profile(founder), build_designer_profile(designer))
+        profile_cache.score_breakdowns.put(key, parts)
+    return dict(parts)
 
-    # ---------- 3) Tools overlap ----------
-    founder_tools = _norm_list(founder.get("tools_used"))
-    designer_tools = _norm_list(designer.get("tools"))
 
-    # up to 3 points
-    max_score += 3
-    if founder_tools and designer_tools:
-        overlap = len(set(founder_tools) & set(designer_tools))
-        score += min(overlap, 3)
+# -----------------------------
+# batch scoring (admin match matrix)
+# -----------------------------
 
-    # ---------- 4) Hours & availability fit ----------
-    # Founder: estimated_hours (string like "3–5 hours a week")
-    founder_hours_raw = founder.get("estimated_hours")
-    founder_hours_val = _parse_hours(founder_hours_raw)
-    founder_bucket = _bucket_hours(founder_hours_val)
+def _encode_founder(founder):
+    profile = founder_profile(founder)
+    return (profile.niche, profile.needs, profile.tools, profile.bucket)
 
-    # Designer: currently only has "availability" (Weekdays / Weekends / Evenings / Flexible)
-    designer_availability = _norm_list(designer.get("availability"))
 
-    # We treat:
-    #   - more availability options = more flexible
-    #   - heavy hours + no availability = bad
-    #   - light hours + any availability = fine
-    max_score += 3
+def _encode_designer(designer):
+    profile = designer_profile(designer)
+    return (profile.niche, profile.focus, profile.tools, profile.extra)
 
-    if founder_bucket is None:
-        # no hours info; give a small neutral bump if designer is broadly available
-        if len(designer_availability) >= 2:
-            score += 1
-    else:
-        # we have some expected intensity
-        if founder_bucket == "light":
-            # any availability is okay
-            if designer_availability:
-                score += 2
-        elif founder_bucket == "medium":
-            # needs at least some flexibility
-            if len(designer_availability) >= 2:
-                score += 2
-            elif designer_availability:
-                score += 1
-        elif founder_bucket == "heavy":
-            # prefers very available designers
-            if "flexible" in designer_availability:
-                score += 3
-            elif len(designer_availability) >= 2:
-                score += 2
 
-    # ---------- 5) Small bonus: designer actually filled niche / goals ----------
-    # Encourages designers who put in more info
-    max_score += 2
-    info_rich = 0
+def encode_profiles(founders, designers):
+    """
+    Encode formatted founders / designers once for batch scoring:
+    (niche, skills, tools, hours) per profile, tags as interned bitsets.
+    Returns (encoded_founders, encoded_designers).
+    """
+    encoded_founders = [_encode_founder(f) for f in founders]
+    encoded_designers = [_encode_designer(d) for d in designers]
+    return encoded_founders, encoded_designers
 
-    if designer_niches:
-        info_rich += 1
-    goals = _norm_list(designer.get("goals"))
-    if goals:
-        info_rich += 1
 
-    score += info_rich  # up to +2
+def raw_score_matrix(encoded_founders, encoded_designers):
+    """
+    Integer scores (0..MAX_RAW_SCORE) for every encoded founder x designer.
+    """
+    matrix = []
+    for f_niche, f_skill, f_tool, bucket in encoded_founders:
+        matrix.append([
+            min((f_niche & d_niche).bit_count(), 4)
+            + min((f_skill & d_skill).bit_count(), 3)
+            + min((f_tool & d_tool).bit_count(), 3)
+            + d_extra[bucket]
+            for d_niche, d_skill, d_tool, d_extra in encoded_designers
+        ])
+    return matrix
+
+
+def score_matrix(founders, designers):
+    """
+    Score every founder against every designer in one call.
 
-    # ---------- final normalization ----------
-    if max_score == 0:
-        return 0.0
+    - founders / designers: dicts from format_founder / format_designer
+    - returns: list of rows where
+        matrix[i][j] == compute_match_score(founders[i], designers[j])
+    """
+    encoded_founders, encoded_designers = encode_profiles(founders, designers)
+    raw = raw_score_matrix(encoded_founders, encoded_designers)
 
-    return round(score / max_score, 4)
+    # same normalization as compute_match_score
+    return [[_NORMALIZED[points] for points in row] for row in raw]
 
 
 # -----------------------------
-# optional helper for admin use
+# global assignment (one-to-one / capacity)
 # -----------------------------
 
-def find_best_designer_for_founder(founder_row):
+def _popcount(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    # numpy < 2.0: count bits byte by byte
+    table = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    return table[values[..., None].view(np.uint8)].sum(axis=-1, dtype=np.uint8)
+
+
+def _numpy_raw_score_matrix(encoded_founders, encoded_designers):
     """
-    Helper used by admin tools.
+    raw_score_matrix as a NumPy int16 array. Needs every interned tag id
+    to fit in 64 bits; returns None otherwise.
+    """
+    if np is None:
+        return None
+    try:
+        founder_bits = np.array([e[:3] for e in encoded_founders], dtype=np.uint64)
+        designer_bits = np.array([e[:3] for e in encoded_designers], dtype=np.uint64)
+    except OverflowError:
+        return None
 
-    - founder_row: raw sqlite row from `founders` table
-    - returns: (best_designer_dict, score) or (None, 0.0)
+    buckets = np.array([e[3] for e in encoded_founders], dtype=np.intp)
+    extra = np.array([e[3] for e in encoded_designers], dtype=np.int16)
+
+    # hours + info points: extra[designer, bucket of founder]
+    matrix = extra[:, buckets].T.copy()
+    for factor, cap in enumerate((4, 3, 3)):
+        overlap = _popcount(founder_bits[:, factor, None] & designer_bits[None, :, factor])
+        matrix += np.minimum(overlap, cap).astype(np.int16)
+    return matrix
+
+
+def _solve_assignment(raw):
+    """
+    Max-score assignment over a founders x columns raw score matrix.
+    Returns [(founder_index, column_index), ...].
+    """
+    if linear_sum_assignment is None:
+        raise RuntimeError("assign_matches needs SciPy: pip install -r requirements.txt")
+    rows, cols = linear_sum_assignment(np.asarray(raw), maximize=True)
+    return list(zip(rows.tolist(), cols.tolist()))
+
+
+def assign_matches(founders, designers, capacity=1):
+    """
+    Global matching in one pass, instead of greedy per founder.
+
+    Every founder gets at most one designer, every designer at most
+    `capacity` founders, and the total score is as high as possible.
+
+    - founders / designers: dicts from format_founder / format_designer
+    - returns: [(founder_dict, designer_dict, score), ...]; pairs that
+      would score 0 are left unmatched
     """
-    founder = format_founder(founder_row)
-    designers_rows = get_all_designers()
+    if not founders or not designers or capacity < 1:
+        return []
 
-    if not designers_rows:
-        return None, 0.0
+    # more slots than founders can never be used
+    capacity = min(capacity, len(founders))
 
-    scored = []
+    encoded_founders, encoded_designers = encode_profiles(founders, designers)
+    raw = _numpy_raw_score_matrix(encoded_founders, encoded_designers)
+    if raw is None:
+        raw = raw_score_matrix(encoded_founders, encoded_designers)
 
-    for row in designers_rows:
-        designer = format_designer(row)
-        s = compute_match_score(founder, designer)
-        scored.append((s, designer))
+    # one column per designer slot
+    if capacity > 1:
+        if isinstance(raw, list):
+            raw = [[points for points in row for _ in range(capacity)] for row in raw]
+        else:
+            raw = np.repeat(raw, capacity, axis=1)
 
-    scored.sort(key=lambda x: x[0], reverse=True)
+    pairs = []
+    for i, column in _solve_assignment(raw):
+        points = int(raw[i][column])
+        if points > 0:
+            pairs.append((founders[i], designers[column // capacity], _NORMALIZED[points]))
+    return pairs
 
-    best_score, best_designer = scored[0]
-    if best_score <= 0:
-        return None, 0.0
 
-    return best_designer, best_score
+# -----------------------------
+# inverted index + top-k retrieval
+# -----------------------------
+
+class DesignerIndex:
+    """
+    In-process inverted index from interned niche / focus / tools ids
+    to designers (by row position).
+
+    Only designers sharing at least one tag with a founder get scored.
+    Everyone else can only earn hours + info points, which are precomputed
+    per founder hours bucket, so they're ranked without scoring each one.
+    """
+
+    def __init__(self, designer_rows=()):
+        self.postings = ({}, {}, {})   # tag id -> [positions], per factor
+        self.designers = []            # DesignerProfile, in row order
+        self.encoded = []              # (niche, focus, tools, extra) per designer, same order
+        self.max_id = 0
+        self.versions = {}             # designer id -> row version
+        self.state = None              # database.get_designers_state() this index reflects
+        self._by_extra = {}            # bucket -> positions sorted by hours + info points
+        for row in designer_rows:
+            self.add(row)
+
+    def __len__(self):
+        return len(self.designers)
+
+    def add(self, designer_row):
+        profile = designer_profile_from_row(designer_row)
+        position = len(self.designers)
+        self.designers.append(profile)
+        # plain tuples unpack faster than slot lookups in the top_k loop
+        self.encoded.append((profile.niche, profile.focus, profile.tools, profile.extra))
+
+        for postings, mask in zip(self.postings, (profile.niche, profile.focus, profile.tools)):
+            for tag_id in _tag_bits(mask):
+                postings.setdefault(tag_id, []).append(position)
+
+        self.max_id = max(self.max_id, profile.id or 0)
+        self.versions[profile.id] = _row_version(designer_row)
+        self._by_extra = {}
+
+    def update(self, designer_row):
+        """Swap in the current version of a designer already in the index."""
+        profile = designer_profile_from_row(designer_row)
+        position = bisect_left(self.designers, profile.id, key=attrgetter("id"))
+        if position == len(self.designers) or self.designers[position].id != profile.id:
+            return
+
+        old = self.designers[position]
+        for postings, mask in zip(self.postings, (old.niche, old.focus, old.tools)):
+            for tag_id in _tag_bits(mask):
+                postings[tag_id].remove(position)
+
+        self.designers[position] = profile
+        self.versions[profile.id] = _row_version(designer_row)
+        self.encoded[position] = (profile.niche, profile.focus, profile.tools, profile.extra)
+        for postings, mask in zip(self.postings, (profile.niche, profile.focus, profile.tools)):
+            for tag_id in _tag_bits(mask):
+                postings.setdefault(tag_id, []).append(position)
+        self._by_extra = {}
+
+    def snapshot(self):
+        """
+        Read-only copy for worker processes, with the per-bucket orderings
+        already built so workers don't each redo them.
+        """
+        copy = DesignerIndex()
+        copy.postings = self.postings
+        copy.designers = self.designers
+        copy.encoded = self.encoded
+        copy.max_id = self.max_id
+        copy.versions = self.versions
+        copy.state = self.state
+        copy._by_extra = {bucket: self._positions_by_extra(bucket) for bucket in _BUCKET_INDEX.values()}
+        return copy
+
+    def _positions_by_extra(self, bucket):
+        positions = self._by_extra.get(bucket)
+        if positions is None:
+            encoded = self.encoded
+            positions = sorted(range(len(encoded)), key=lambda p: (-encoded[p][3][bucket], p))
+            self._by_extra[bucket] = positions
+        return positions
+
+    def top_k(self, founder, k=5):
+        """
+        Best k designers for a founder (formatted dict or FounderProfile).
+
+        - returns: [(DesignerProfile, score), ...] best first; ties keep row
+          order, same as a stable sort over compute_match_score.
+        """
+        if k <= 0 or not self.designers:
+            return []
+
+        profile = founder if isinstance(founder, FounderProfile) else founder_profile(founder)
+        f_niche, f_needs, f_tools, bucket = profile.niche, profile.needs, profile.tools, profile.bucket
+
+        candidates = set()
+        for postings, mask in zip(self.postings, (f_niche, f_needs, f_tools)):
+            for tag_id in _tag_bits(mask):
+                candidates.update(postings.get(tag_id, ()))
+
+        encoded = self.encoded
+        scored = []
+        for position in candidates:
+            d_niche, d_focus, d_tools, d_extra = encoded[position]
+            points = (
+                min((f_niche & d_niche).bit_count(), 4)
+                + min((f_needs & d_focus).bit_count(), 3)
+                + min((f_tools & d_tools).bit_count(), 3)
+                + d_extra[bucket]
+            )
+            scored.append((points, -position))
+
+        # no overlap -> score is exactly the hours + info points,
+        # so the best of the rest are the first k in that ordering
+        rest = 0
+        for position in self._positions_by_extra(bucket):
+            if rest == k:
+                break
+            if position in candidates:
+                continue
+            scored.append((encoded[position][3][bucket], -position))
+            rest += 1
+
+        return [
+            (self.designers[-neg_position], _NORMALIZED[points])
+            for points, neg_position in heapq.nlargest(k, scored)
+        ]
+
+
+_designer_index = None
+_designer_index_lock = threading.Lock()
+
+
+def _row_version(designer_row):
+    return designer_row[16] if len(designer_row) > 16 else 1
+
+
+def _refresh_designer_index(index, state):
+    """
+    Bring `index` up to `state`: add new rows, swap in re-submitted ones.
+    Returns a fresh index when designers were deleted (migration dedupe,
+    manual cleanup), since positions can't be dropped in place.
+    """
+    for row in get_designers_after(index.max_id):
+        index.add(row)
+    if (len(index), index.max_id, sum(index.versions.values())) != state:
+        current = get_designer_versions()
+        if any(designer_id not in current for designer_id in index.versions):
+            index = DesignerIndex(iter_designers())
+        else:
+            for designer_id, version in current.items():
+                if index.versions.get(designer_id, version) != version:
+                    row = get_designer_by_id(designer_id)
+                    if row is not None:
+                        index.update(row)
+    index.state = state
+    return index
+
+
+def get_designer_index():
+    """
+    Shared DesignerIndex, refreshed whenever the designers table changed:
+    rows added, re-submitted or deleted by any process (other workers,
+    the importer, the rematch job, migrations).
+    """
+    global _designer_index
+    with _designer_index_lock:
+        state = get_designers_state()
+        if _designer_index is None:
+            _designer_index = DesignerIndex(iter_designers())
+            _designer_index.state = state
+        elif _designer_index.state != state:
+            _designer_index = _refresh_designer_index(_designer_index, state)
+        return _designer_index
+
+
+# -----------------------------
+# optional helper for admin use
+# -----------------------------
+
+def find_best_designer_for_founder(founder_row, index=None):
+    """
+    Helper used by admin tools.
+
+    - founder_row: raw sqlite row from `founders` table
+    - index: optional DesignerIndex (defaults to the shared one)
+    - returns: (best_designer_dict, score) or (None, 0.0)
+    """
+    founder = founder_profile_from_row(founder_row)
+    if index is None:
+        index = get_designer_index()
+
+    # the index only keeps compact profiles; the dict is for display.
+    # A caller's index may still hold designers deleted since, so skip those
+    for best_designer, best_score in index.top_k(founder, 5):
+        if best_score <= 0:
+            break
+        row = get_designer_by_id(best_designer.id)
+        if row is not None:
+            return format_designer(row), best_score
+    return None, 0.0
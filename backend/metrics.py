@@ -0,0 +1,185 @@
+# metrics.py
+#
+# In-process request metrics, exposed in Prometheus text format on /metrics.
+#
+# - MetricsMiddleware times every request and labels it with the route template
+# - stage("db" | "email" | "template") adds time spent in a block to the current
+#   request's stage breakdown (and is a cheap no-op outside a request)
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# stage name -> seconds, for the request being handled
+_request_stages = ContextVar("request_stages", default=None)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}   # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += seconds
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        for label_values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_labels(self.labels + ('le',), label_values + (bound,))} {cumulative}"
+                )
+            lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), label_values + ('+Inf',))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, label_values)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labels, label_values)} {series[-1]}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+# -----------------------------
+# the metrics we keep
+# -----------------------------
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "End-to-end request latency", ("method", "route"))
+http_request_stage = Histogram(
+    "http_request_stage_seconds", "Time per request spent in each stage", ("route", "stage"))
+db_connections_opened = Counter(
+    "db_connections_opened_total", "New database connections opened", ("backend",))
+emails = Counter(
+    "emails_total", "Emails handed to the provider, by outcome", ("result",))
+write_batch_size = Histogram(
+    "write_batch_size", "Submissions committed per group-commit transaction", (),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+write_queue_rejected = Counter(
+    "write_queue_rejected_total", "Submissions refused because the write queue was full", ("owner",))
+requests_shed = Counter(
+    "requests_shed_total", "Submissions refused by rate limits or load shedding", ("route", "reason"))
+
+REGISTRY = [
+    http_requests, http_request_duration, http_request_stage, db_connections_opened, emails,
+    write_batch_size, write_queue_rejected, requests_shed,
+]
+
+
+def render():
+    """All metrics in Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------------
+# per-request stage timing
+# -----------------------------
+
+def add_stage_time(name, seconds):
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[name] = stages.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name):
+    """Time a block as part of the current request's `name` stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage_time(name, time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware: latency + status per route template, plus the
+    per-stage breakdown collected by stage() while the request ran.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages = {}
+        token = _request_stages.set(stages)
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stages.reset(token)
+
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+
+            http_requests.inc(method, path, status[0])
+            http_request_duration.observe(elapsed, method, path)
+            for name, seconds in stages.items():
+                http_request_stage.observe(seconds, path, name)
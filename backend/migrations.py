@@ -0,0 +1,533 @@
+# migrations.py
+#
+# Versioned schema for the matcher database.
+#
+# MIGRATIONS is an ordered list of (version, name, step). The schema_version
+# table records every applied step, so a current database costs a single
+# SELECT at startup. Pending steps run in one transaction under a lock
+# (BEGIN IMMEDIATE on SQLite, an advisory lock on PostgreSQL); the version is
+# re-read once the lock is held, so concurrent workers apply each step once.
+#
+#   python -m backend.migrations                      # migrate
+#   python -m backend.migrations status
+#   python -m backend.migrations import-legacy ./matcher.db
+#
+# New schema changes go at the end of MIGRATIONS; applied steps never change.
+import argparse
+import sqlite3
+import sys
+
+from .database import (
+    USE_POSTGRES,
+    format_designer,
+    format_founder,
+    get_connection,
+    get_cursor,
+    get_placeholder,
+    write_tags,
+)
+
+# pg_advisory_xact_lock key held while migrating
+MIGRATION_LOCK_ID = 4_207_117
+
+# Column layout written by the old app.py init_db: canonical -> legacy column.
+# Multi-select values were joined with ", " there, "," in the canonical layout.
+LEGACY_LAYOUTS = {
+    "designers": {
+        "full_name": "name",
+        "email": "email",
+        "availability": "availability",
+        "interest_areas": "experience_interests",
+        "niche_interest": "niche_interests",
+        "tools": "tools_comfort",
+        "figma_experience": "figma_skill",
+    },
+    "founders": {
+        "full_name": "name",
+        "email": "email",
+        "design_help": "design_help_needed",
+        "niche": "project_niche",
+        "estimated_hours": "weekly_hours",
+        "support_level": "founder_support",
+    },
+}
+_LEGACY_LIST_COLUMNS = {"experience_interests", "niche_interests", "tools_comfort",
+                        "design_help_needed", "project_niche"}
+
+
+def _id_column():
+    return "SERIAL PRIMARY KEY" if USE_POSTGRES else "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+
+def _columns(cur, table):
+    """Column names of `table` ([] when it doesn't exist)."""
+    if USE_POSTGRES:
+        cur.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+            ORDER BY ordinal_position
+        """, (table,))
+        return [row["column_name"] for row in cur.fetchall()]
+    cur.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cur.fetchall()]
+
+
+# -----------------------------
+# 001: baseline
+# -----------------------------
+def _create_designers(cur):
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS designers (
+        id {_id_column()},
+        full_name TEXT,
+        email TEXT,
+        city_country TEXT,
+        portfolio TEXT,
+        availability TEXT,
+        focus TEXT,
+        interest_areas TEXT,
+        unpaid_experience TEXT,
+        goals TEXT,
+        niche_interest TEXT,
+        tools TEXT,
+        figma_experience TEXT,
+        resources TEXT,
+        extra_notes TEXT,
+        newsletter TEXT
+    )
+    """)
+
+
+def _create_founders(cur):
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS founders (
+        id {_id_column()},
+        full_name TEXT,
+        email TEXT,
+        project_name TEXT,
+        website TEXT,
+        project_stage TEXT,
+        design_help TEXT,
+        tools_used TEXT,
+        paid_role TEXT,
+        niche TEXT,
+        estimated_hours TEXT,
+        beginner_friendly TEXT,
+        support_level TEXT,
+        extra_notes TEXT
+    )
+    """)
+
+
+def _baseline(cur):
+    _create_designers(cur)
+    _create_founders(cur)
+
+    # Matches table (for database_matches.py)
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS matches (
+        id {_id_column()},
+        founder_email TEXT,
+        designer_email TEXT,
+        score REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+    # Lookup indexes (profiles by email, match log by founder / designer / time / score)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_designers_email ON designers (email)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_founders_email ON founders (email)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_matches_created ON matches (created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_matches_founder ON matches (founder_email, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_matches_designer ON matches (designer_email, created_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_matches_score ON matches (score)")
+
+    # Outbox for emails sent by the background worker (email_outbox.py)
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS email_outbox (
+        id {_id_column()},
+        to_email TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        html TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at {"DOUBLE PRECISION" if USE_POSTGRES else "REAL"} NOT NULL,
+        last_error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        sent_at TIMESTAMP
+    )
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+    ON email_outbox (status, next_attempt_at)
+    """)
+
+    # Tag dictionary + junction tables (normalized multi-select values)
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS tags (
+        id {_id_column()},
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL,
+        UNIQUE (kind, value)
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS designer_tags (
+        designer_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        PRIMARY KEY (designer_id, tag_id)
+    )
+    """)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS founder_tags (
+        founder_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        PRIMARY KEY (founder_id, tag_id)
+    )
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_designer_tags_tag
+    ON designer_tags (tag_id, designer_id)
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_founder_tags_tag
+    ON founder_tags (tag_id, founder_id)
+    """)
+
+    # Persisted top-K designers per founder (kept current by database_matches)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS top_matches (
+        founder_id INTEGER NOT NULL,
+        designer_id INTEGER NOT NULL,
+        score REAL NOT NULL,
+        PRIMARY KEY (founder_id, designer_id)
+    )
+    """)
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_top_matches_founder_score
+    ON top_matches (founder_id, score DESC)
+    """)
+
+    # Single-row counter bumped by every profile / match write; admin
+    # pages are cached per version (shared by every process on the DB)
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY,
+        version BIGINT NOT NULL
+    )
+    """)
+    cur.execute("""
+    INSERT INTO data_version (id, version) VALUES (1, 0)
+    ON CONFLICT (id) DO NOTHING
+    """)
+
+
+# -----------------------------
+# 002: reconcile the legacy app.py layout
+# -----------------------------
+def _reconcile_legacy_profiles(cur):
+    """
+    The old app.py created designers / founders with its own columns at
+    import time; when that ran first on this database, the baseline's
+    CREATE TABLE IF NOT EXISTS kept them. Rebuild such tables in the
+    canonical layout, keeping ids.
+    """
+    for table, layout in LEGACY_LAYOUTS.items():
+        columns = _columns(cur, table)
+        if "full_name" in columns or "name" not in columns:
+            continue
+
+        owner = table[:-1]
+        select = [
+            f"REPLACE({legacy}, ', ', ',')" if legacy in _LEGACY_LIST_COLUMNS else legacy
+            for legacy in layout.values()
+        ]
+        cur.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        (_create_designers if table == "designers" else _create_founders)(cur)
+        cur.execute(f"""
+            INSERT INTO {table} (id, {', '.join(layout)})
+            SELECT id, {', '.join(select)} FROM {table}_legacy
+        """)
+        cur.execute(f"DROP TABLE {table}_legacy")
+        cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_email ON {table} (email)")
+        if USE_POSTGRES:
+            cur.execute(f"""
+                SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false)
+                FROM {table}
+            """)
+        # tags mirrored from the legacy columns are wrong; 003 rewrites them
+        cur.execute(f"DELETE FROM {owner}_tags")
+        print(f"✅ Rebuilt legacy {table} table in the current layout")
+
+
+# -----------------------------
+# 003: tag backfill
+# -----------------------------
+def _backfill_tags(cur):
+    # mirror rows saved before the tag tables existed
+    from .database_tags import backfill_tags
+    backfill_tags(cur)
+
+
+# -----------------------------
+# 004: one profile per email
+# -----------------------------
+def _merge(rows):
+    """
+    Duplicate rows (oldest first) -> the oldest id with the newest non-empty
+    value of every other column.
+    """
+    merged = list(rows[0])
+    for row in rows[1:]:
+        for i, value in enumerate(row[1:], start=1):
+            if value not in (None, ""):
+                merged[i] = value
+    return merged
+
+
+def _dedupe_profiles(cur):
+    """
+    Re-submissions used to add a row each. Normalize emails, merge every
+    group of duplicates into its oldest row (keeping the id, taking the
+    newest non-empty value of each column), then enforce uniqueness.
+    """
+    placeholder = get_placeholder()
+    for owner, table, formatter in (
+        ("designer", "designers", format_designer),
+        ("founder", "founders", format_founder),
+    ):
+        cur.execute(f"UPDATE {table} SET email = LOWER(TRIM(email)) WHERE email IS NOT NULL")
+        # blank emails can't be matched to anyone; NULLs don't collide
+        cur.execute(f"UPDATE {table} SET email = NULL WHERE email = ''")
+
+        columns = _columns(cur, table)
+        cur.execute(f"""
+            SELECT * FROM {table}
+            WHERE email IN (SELECT email FROM {table} GROUP BY email HAVING COUNT(*) > 1)
+            ORDER BY email, id
+        """)
+        rows = [tuple(row.values()) if USE_POSTGRES else tuple(row) for row in cur.fetchall()]
+
+        groups = {}
+        for row in rows:
+            groups.setdefault(row[columns.index("email")], []).append(row)
+
+        removed = 0
+        for duplicates in groups.values():
+            merged = _merge(duplicates)
+            keep_id = merged[0]
+            drop_ids = [row[0] for row in duplicates[1:]]
+
+            cur.execute(f"""
+                UPDATE {table} SET {', '.join(f"{c} = {placeholder}" for c in columns[1:])}
+                WHERE id = {placeholder}
+            """, (*merged[1:], keep_id))
+            for linked in (f"{owner}_tags", "top_matches"):
+                cur.executemany(
+                    f"DELETE FROM {linked} WHERE {owner}_id = {placeholder}",
+                    [(drop_id,) for drop_id in drop_ids],
+                )
+            cur.executemany(f"DELETE FROM {table} WHERE id = {placeholder}", [(i,) for i in drop_ids])
+            write_tags(cur, owner, keep_id, formatter(merged))
+            removed += len(drop_ids)
+
+        cur.execute(f"DROP INDEX IF EXISTS idx_{table}_email")
+        cur.execute(f"CREATE UNIQUE INDEX idx_{table}_email ON {table} (email)")
+        if removed:
+            print(f"✅ Merged {removed} duplicate {table} into {len(groups)} profiles")
+
+
+# -----------------------------
+# 005: profile versions
+# -----------------------------
+def _profile_versions(cur):
+    # bumped by every upsert; keys the score breakdown memo (match.py)
+    for table in ("designers", "founders"):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+
+# -----------------------------
+# 006: full-text search
+# -----------------------------
+def _full_text_search(cur):
+    """
+    Search indexes for database_search: a GIN expression index on
+    PostgreSQL; on SQLite an FTS5 table per profile table, filled from the
+    existing rows and kept current by triggers.
+    """
+    from .database_search import SEARCH_DOCUMENTS, SEARCH_WEIGHTS, fts_document, pg_document
+
+    for table, document in SEARCH_DOCUMENTS.items():
+        if USE_POSTGRES:
+            cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_search ON {table} USING GIN ({pg_document(table)})")
+            continue
+
+        fields = ", ".join(document)
+        fts = f"{table}_fts"
+        cur.execute(f"DROP TABLE IF EXISTS {fts}")
+        cur.execute(f"""
+            CREATE VIRTUAL TABLE {fts}
+            USING fts5({fields}, tokenize = 'unicode61 remove_diacritics 2')
+        """)
+        # default ORDER BY rank: bm25 with per-field weights
+        weights = ", ".join(str(SEARCH_WEIGHTS[field]) for field in document)
+        cur.execute(f"INSERT INTO {fts} ({fts}, rank) VALUES ('rank', 'bm25({weights})')")
+
+        cur.execute(f"INSERT INTO {fts} (rowid, {fields}) SELECT id, {fts_document(table)} FROM {table}")
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {fields}) VALUES (new.id, {fts_document(table, "new.")});
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE ON {table} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+                INSERT INTO {fts} (rowid, {fields}) VALUES (new.id, {fts_document(table, "new.")});
+            END
+        """)
+        cur.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM {fts} WHERE rowid = old.id;
+            END
+        """)
+
+
+MIGRATIONS = [
+    (1, "baseline", _baseline),
+    (2, "reconcile legacy profile layout", _reconcile_legacy_profiles),
+    (3, "backfill tags", _backfill_tags),
+    (4, "one profile per email", _dedupe_profiles),
+    (5, "profile versions", _profile_versions),
+    (6, "full-text search", _full_text_search),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def _read_version(conn, cur):
+    """Highest applied version; 0 before the first migration."""
+    try:
+        cur.execute("SELECT MAX(version) AS version FROM schema_version")
+        row = cur.fetchone()
+    except Exception:
+        # no schema_version table yet
+        conn.rollback()
+        return 0
+    version = row["version"] if USE_POSTGRES else row[0]
+    return version or 0
+
+
+def _lock(cur):
+    """Take the migration lock for the current transaction."""
+    if USE_POSTGRES:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+    else:
+        cur.execute("BEGIN IMMEDIATE")
+
+
+def schema_version():
+    conn = get_connection()
+    cur = get_cursor(conn)
+    try:
+        return _read_version(conn, cur)
+    finally:
+        conn.close()
+
+
+def migrate():
+    """
+    Apply every pending migration. Returns the number applied (0 when the
+    schema is current, after one version check).
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    try:
+        if _read_version(conn, cur) >= LATEST_VERSION:
+            return 0
+
+        _lock(cur)
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+        # another worker may have migrated while we waited for the lock
+        current = _read_version(conn, cur)
+
+        placeholder = get_placeholder()
+        pending = [m for m in MIGRATIONS if m[0] > current]
+        for version, name, step in pending:
+            step(cur)
+            cur.execute(
+                f"INSERT INTO schema_version (version, name) VALUES ({placeholder}, {placeholder})",
+                (version, name),
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    for version, name, _ in pending:
+        print(f"✅ Applied migration {version:03d}: {name}")
+    return len(pending)
+
+
+# -----------------------------
+# Legacy database import
+# -----------------------------
+def read_legacy_records(path, table):
+    """
+    Rows of a table in a separate legacy matcher.db (the old app.py wrote
+    ./matcher.db relative to its working directory), keyed by the canonical
+    column names.
+    """
+    legacy = sqlite3.connect(path)
+    legacy.row_factory = sqlite3.Row
+    try:
+        for n, row in enumerate(legacy.execute(f"SELECT * FROM {table} ORDER BY id"), start=1):
+            keys = row.keys()
+            yield n, {
+                column: row[source]
+                for column, source in LEGACY_LAYOUTS[table].items()
+                if source in keys
+            }
+    finally:
+        legacy.close()
+
+
+def import_legacy(path):
+    """Copy designers / founders out of a legacy database file. Returns {table: (ids, rejects)}."""
+    from .importer import import_records
+
+    results = {}
+    for table in LEGACY_LAYOUTS:
+        results[table] = import_records(table[:-1], read_legacy_records(path, table))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Database schema migrations")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("status", help="show the applied / latest schema version")
+    legacy = sub.add_parser("import-legacy", help="copy profiles out of an old app.py matcher.db")
+    legacy.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        print(f"schema version {schema_version()} (latest {LATEST_VERSION})")
+        sys.exit(0)
+
+    applied = migrate()
+    print(f"✅ Schema at version {LATEST_VERSION} ({applied} migrations applied)")
+
+    if args.command == "import-legacy":
+        for table, (ids, rejects) in import_legacy(args.path).items():
+            print(f"✅ Imported {len(ids)} {table} ({len(rejects)} rejected)")
+            for reject in rejects[:20]:
+                print(f"   row {reject['line']}: {reject['error']}")
@@ -0,0 +1,64 @@
+# profile_cache.py
+#
+# Pre-normalized founder / designer profiles and score breakdowns, keyed by
+# row id + version. Every upsert bumps the version (in whichever process
+# wrote it), so stale entries are simply never hit again.
+# match.py fills it.
+
+import os
+import threading
+from collections import OrderedDict
+
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+SCORE_BREAKDOWN_CACHE_SIZE = int(os.getenv("SCORE_BREAKDOWN_CACHE_SIZE", "10000"))
+
+
+class LRUCache:
+    """
+    Small thread-safe LRU map with a fixed size bound.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+designer_profiles = LRUCache(PROFILE_CACHE_SIZE)
+founder_profiles = LRUCache(PROFILE_CACHE_SIZE)
+# (founder id, version, designer id, version) -> match.score_breakdown dict
+score_breakdowns = LRUCache(SCORE_BREAKDOWN_CACHE_SIZE)
+
+
+def clear():
+    designer_profiles.clear()
+    founder_profiles.clear()
+    score_breakdowns.clear()
@@ -0,0 +1,171 @@
+# rate_limit.py
+#
+# In-process protection for the public submission endpoints.
+#
+# - SubmissionLimitMiddleware, in front of every POST to SUBMIT_PATHS:
+#     - per client IP token bucket  -> 429 + Retry-After
+#     - global cap on submissions in flight -> 503 + Retry-After
+#   Both run before the form body is read, so shed requests cost next to
+#   nothing and never reach the DB or the email outbox.
+# - check_email(), called by the routes once the form is parsed: per email
+#   address token bucket -> 429, which also caps confirmation emails per
+#   address.
+#
+# Every shed request is counted in requests_shed_total{route, reason}.
+# Limits are per process; a rate of 0 disables that limit.
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi.responses import PlainTextResponse
+
+from . import metrics
+from .database import normalize_email
+
+SUBMIT_PATHS = ("/submit-designer", "/submit-founder")
+
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "20"))
+RATE_LIMIT_IP_BURST = float(os.getenv("RATE_LIMIT_IP_BURST", "10"))
+RATE_LIMIT_EMAIL_PER_HOUR = float(os.getenv("RATE_LIMIT_EMAIL_PER_HOUR", "5"))
+RATE_LIMIT_EMAIL_BURST = float(os.getenv("RATE_LIMIT_EMAIL_BURST", "3"))
+# submissions handled at once by this process; the rest get a fast 503
+SUBMIT_MAX_IN_FLIGHT = int(os.getenv("SUBMIT_MAX_IN_FLIGHT", "64"))
+# proxies in front of the app that append to X-Forwarded-For. 0 (default)
+# uses the socket peer address; behind a proxy (Render: set 1) that address
+# is the proxy's, so set it to the number of proxies. More than there are
+# lets clients pick their own IP through the header
+RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "0"))
+# buckets kept per limit; the least recently seen key is forgotten first
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+class TokenBuckets:
+    """
+    One token bucket per key: refills at `rate` tokens per second up to
+    `burst`; each request spends one token.
+    """
+
+    def __init__(self, rate, burst, max_keys=RATE_LIMIT_MAX_KEYS):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # key -> (tokens, monotonic time)
+        self._lock = threading.Lock()
+
+    def take(self, key, now=None):
+        """Spend a token. Returns 0 if allowed, else seconds until one is free."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, stamp = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class InFlightLimit:
+    """Non-blocking cap on concurrent work: try_acquire() or shed."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.current = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.limit > 0 and self.current >= self.limit:
+                return False
+            self.current += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.current -= 1
+
+
+ip_buckets = TokenBuckets(RATE_LIMIT_IP_PER_MINUTE / 60, RATE_LIMIT_IP_BURST)
+email_buckets = TokenBuckets(RATE_LIMIT_EMAIL_PER_HOUR / 3600, RATE_LIMIT_EMAIL_BURST)
+submissions_in_flight = InFlightLimit(SUBMIT_MAX_IN_FLIGHT)
+
+
+def _retry_after(seconds):
+    return str(max(1, int(seconds + 0.999)))
+
+
+def too_many_requests(seconds):
+    return PlainTextResponse(
+        "Too many submissions. Please wait a moment and try again.",
+        status_code=429,
+        headers={"Retry-After": _retry_after(seconds)},
+    )
+
+
+def overloaded():
+    return PlainTextResponse(
+        "We're getting a lot of submissions right now. Please try again in a moment.",
+        status_code=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+def client_ip(scope):
+    """Client address, taken from X-Forwarded-For behind trusted proxies."""
+    if RATE_LIMIT_TRUSTED_PROXIES > 0:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                hops = [hop.strip() for hop in value.decode("latin-1").split(",") if hop.strip()]
+                # entries before the ones our proxies appended are client-controlled
+                if hops:
+                    return hops[max(0, len(hops) - RATE_LIMIT_TRUSTED_PROXIES)]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def check_email(route, email):
+    """429 response when this address submitted too often, else None."""
+    wait = email_buckets.take(normalize_email(email))
+    if wait:
+        metrics.requests_shed.inc(route, "email_rate")
+        return too_many_requests(wait)
+    return None
+
+
+class SubmissionLimitMiddleware:
+    """
+    Plain ASGI middleware: per-IP rate limit + in-flight cap on POSTs to
+    SUBMIT_PATHS, answered before the app (or the form parser) runs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path")
+        if scope["type"] != "http" or scope.get("method") != "POST" or path not in SUBMIT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        wait = ip_buckets.take(client_ip(scope))
+        if wait:
+            metrics.requests_shed.inc(path, "ip_rate")
+            await too_many_requests(wait)(scope, receive, send)
+            return
+
+        if not submissions_in_flight.try_acquire():
+            metrics.requests_shed.inc(path, "overload")
+            await overloaded()(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            submissions_in_flight.release()
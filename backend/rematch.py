@@ -0,0 +1,115 @@
+# rematch.py
+#
+# Offline full recompute of every founder's best designers, spread over all
+# cores. Meant for a nightly job, never for a request:
+#
+#   python -m backend.rematch --workers 8
+#
+# The parent builds the designer index once and ships a read-only snapshot
+# to each worker process (once, via the pool initializer). Founders are
+# streamed from the DB as chunks of compact profiles, with tags interned in
+# the parent so ids agree with the snapshot. Each chunk's top-K comes back
+# as soon as it's done and is written straight away:
+#   - appended to the `matches` log (one bulk insert per chunk)
+#   - swapped into `top_matches` for those founders
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .database import count_founders, iter_founders
+from .database_matches import MATCH_TOP_K, replace_top_matches, save_match_records
+from .match import founder_profile_from_row, get_designer_index
+
+REMATCH_CHUNK_SIZE = int(os.getenv("REMATCH_CHUNK_SIZE", "500"))
+
+# set in each worker process by _init_worker
+_snapshot = None
+
+
+def _init_worker(snapshot):
+    global _snapshot
+    _snapshot = snapshot
+
+
+def _rank_chunk(founders, k):
+    """Worker side: [(founder_id, founder_email, designer_id, designer_email, score), ...]"""
+    results = []
+    for founder in founders:
+        for designer, score in _snapshot.top_k(founder, k):
+            if score > 0:
+                results.append((founder.id, founder.email, designer.id, designer.email, score))
+    return results
+
+
+def _founder_chunks(chunk_size):
+    chunk = []
+    for row in iter_founders():
+        chunk.append(founder_profile_from_row(row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write(founder_ids, results, log):
+    replace_top_matches(founder_ids, [(f_id, d_id, score) for f_id, _, d_id, _, score in results])
+    if log:
+        save_match_records([(f_email, d_email, score) for _, f_email, _, d_email, score in results])
+
+
+def rematch_all(workers=None, k=MATCH_TOP_K, chunk_size=REMATCH_CHUNK_SIZE, log=True):
+    """
+    Recompute top-K designers for every founder on a process pool.
+
+    - workers: processes (default: all cores)
+    - log: also append the results to the `matches` log
+    - returns: (founders_processed, matches_written)
+    """
+    workers = workers or os.cpu_count() or 1
+    total = count_founders()
+    snapshot = get_designer_index().snapshot()
+    print(f"▶ Rematching {total} founders against {len(snapshot)} designers on {workers} workers", file=sys.stderr)
+
+    start = time.perf_counter()
+    done = written = 0
+    chunks = _founder_chunks(chunk_size)
+    pending = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(snapshot,)) as pool:
+        while True:
+            # keep a couple of chunks per worker in flight; memory stays bounded
+            while len(pending) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending[pool.submit(_rank_chunk, chunk, k)] = [f.id for f in chunk]
+            if not pending:
+                break
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                founder_ids = pending.pop(future)
+                results = future.result()
+                _write(founder_ids, results, log)
+
+                done += len(founder_ids)
+                written += len(results)
+                rate = done / max(time.perf_counter() - start, 1e-9)
+                print(f"… {done}/{total} founders ({rate:.0f}/s)", file=sys.stderr)
+
+    return done, written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute every founder's matches on all cores")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--k", type=int, default=MATCH_TOP_K, help="designers kept per founder")
+    parser.add_argument("--chunk-size", type=int, default=REMATCH_CHUNK_SIZE, help="founders per task")
+    parser.add_argument("--no-log", action="store_true", help="only refresh top_matches, skip the matches log")
+    args = parser.parse_args()
+
+    founders, matches = rematch_all(args.workers, args.k, args.chunk_size, log=not args.no_log)
+    print(f"✅ Rematched {founders} founders ({matches} matches)")
@@ -0,0 +1,257 @@
+# write_queue.py
+#
+# Group commit for form submissions.
+#
+# Routes hand their profile (plus its confirmation email) to submit() and
+# await it. A single writer thread collects whatever arrives within
+# WRITE_QUEUE_LINGER_MS (up to WRITE_QUEUE_BATCH_MAX items) and writes the
+# lot in one transaction with multi-row INSERTs: one write lock, a handful of
+# statements and one commit for the whole batch instead of per request. Each
+# submit() resolves only after that commit, with the new profile id.
+#
+# The queue holds at most WRITE_QUEUE_MAX submissions; past that submit()
+# raises WriteQueueFull right away and the route answers 503, instead of
+# piling up requests the database can't absorb.
+#
+# Match updates for the new profiles run afterwards on their own thread, so
+# scoring never holds up the next batch.
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+from .database import bump_data_version, get_connection, get_cursor, upsert_profiles
+from .email_outbox import insert_emails
+
+WRITE_QUEUE_MAX = int(os.getenv("WRITE_QUEUE_MAX", "1000"))
+WRITE_QUEUE_BATCH_MAX = int(os.getenv("WRITE_QUEUE_BATCH_MAX", "200"))
+WRITE_QUEUE_LINGER_MS = float(os.getenv("WRITE_QUEUE_LINGER_MS", "5"))
+
+
+class WriteQueueFull(Exception):
+    """The write queue is at WRITE_QUEUE_MAX; retry later."""
+
+
+class _Submission:
+    __slots__ = ("owner", "data", "email", "loop", "future")
+
+    def __init__(self, owner, data, email, loop, future):
+        self.owner = owner
+        self.data = data
+        self.email = email          # (to, subject, html) or None
+        self.loop = loop
+        self.future = future
+
+    def resolve(self, result=None, error=None):
+        try:
+            if error is not None:
+                self.loop.call_soon_threadsafe(_set_exception, self.future, error)
+            else:
+                self.loop.call_soon_threadsafe(_set_result, self.future, result)
+        except RuntimeError:
+            pass    # the submitting event loop is gone (shutdown)
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_results(results):
+    for future, result in results:
+        _set_result(future, result)
+
+
+def _resolve_all(done):
+    """Resolve [(submission, id), ...] with one wake-up per event loop."""
+    by_loop = {}
+    for submission, new_id in done:
+        by_loop.setdefault(submission.loop, []).append((submission.future, new_id))
+    for loop, results in by_loop.items():
+        try:
+            loop.call_soon_threadsafe(_set_results, results)
+        except RuntimeError:
+            pass    # the submitting event loop is gone (shutdown)
+
+
+def _set_exception(future, error):
+    if not future.done():
+        future.set_exception(error)
+
+
+_queue = queue.Queue(maxsize=WRITE_QUEUE_MAX)
+_writer = None
+_writer_lock = threading.Lock()
+_match_executor = None
+
+
+# -----------------------------
+# Submitting
+# -----------------------------
+async def submit(owner, data, email=None):
+    """
+    Queue a designer / founder for the next group commit and wait until
+    it is committed.
+
+    - owner: "designer" or "founder"
+    - data: save_designer / save_founder input
+    - email: optional (to, subject, html) enqueued in the same transaction
+    - returns: the new profile id
+    - raises: WriteQueueFull when the queue is at capacity
+    """
+    _ensure_writer()
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    try:
+        _queue.put_nowait(_Submission(owner, data, email, loop, future))
+    except queue.Full:
+        metrics.write_queue_rejected.inc(owner)
+        raise WriteQueueFull(f"write queue full ({WRITE_QUEUE_MAX} pending)") from None
+    with metrics.stage("db"):
+        return await future
+
+
+def depth():
+    return _queue.qsize()
+
+
+# -----------------------------
+# Writer thread
+# -----------------------------
+def _ensure_writer():
+    global _writer, _match_executor
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _match_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="match")
+                _writer = threading.Thread(target=_run, name="write-queue", daemon=True)
+                _writer.start()
+
+
+def _next_batch():
+    """Block for one submission, then gather more for up to the linger time."""
+    item = _queue.get()
+    if item is None:
+        return None
+    batch = [item]
+    deadline = time.monotonic() + WRITE_QUEUE_LINGER_MS / 1000
+    while len(batch) < WRITE_QUEUE_BATCH_MAX:
+        remaining = deadline - time.monotonic()
+        try:
+            item = _queue.get(timeout=remaining) if remaining > 0 else _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is None:
+            # shutdown: write what we have, then stop
+            _queue.put(None)
+            break
+        batch.append(item)
+    return batch
+
+
+def _insert(cur, batch):
+    """Bulk insert a batch's profiles + emails; returns ids in batch order."""
+    ids = [None] * len(batch)
+    for owner in ("designer", "founder"):
+        positions = [i for i, submission in enumerate(batch) if submission.owner == owner]
+        if positions:
+            new_ids = upsert_profiles(cur, owner, [batch[i].data for i in positions])
+            for i, new_id in zip(positions, new_ids):
+                ids[i] = new_id
+    emails = [submission.email for submission in batch if submission.email]
+    if emails:
+        insert_emails(cur, emails)
+    bump_data_version(cur)
+    return ids
+
+
+def _write_batch(batch):
+    """
+    One transaction for the batch; if it fails, retry one by one so only
+    the offending submissions fail. Returns [(submission, id or None), ...].
+    """
+    conn = get_connection()
+    cur = get_cursor(conn)
+    try:
+        try:
+            ids = _insert(cur, batch)
+            conn.commit()
+            metrics.write_batch_size.observe(len(batch))
+            return list(zip(batch, ids))
+        except Exception as e:
+            conn.rollback()
+            print(f"❌ Batch write failed ({e}); retrying {len(batch)} submissions one by one")
+
+        written = []
+        for submission in batch:
+            try:
+                new_id, = _insert(cur, [submission])
+                conn.commit()
+                written.append((submission, new_id))
+            except Exception as e:
+                conn.rollback()
+                print(f"❌ Error saving {submission.owner}: {e}")
+                submission.resolve(error=e)
+                written.append((submission, None))
+        return written
+    finally:
+        conn.close()
+
+
+def _update_matches(owner, ids):
+    from .database_matches import update_matches_for_designer, update_matches_for_founder
+
+    update = update_matches_for_designer if owner == "designer" else update_matches_for_founder
+    for profile_id in ids:
+        try:
+            update(profile_id)
+        except Exception as e:
+            print(f"❌ Error updating matches for {owner} {profile_id}: {e}")
+
+
+def _run():
+    while True:
+        batch = _next_batch()
+        if batch is None:
+            return
+        try:
+            written = _write_batch(batch)
+        except Exception as e:
+            # e.g. no connection to be had; fail the whole batch
+            print(f"❌ Write queue batch lost: {e}")
+            for submission in batch:
+                submission.resolve(error=e)
+            continue
+
+        new_ids = {"designer": [], "founder": []}
+        done = []
+        for submission, new_id in written:
+            if new_id is None:
+                continue
+            new_ids[submission.owner].append(new_id)
+            done.append((submission, new_id))
+        _resolve_all(done)
+
+        for owner, ids in new_ids.items():
+            if ids:
+                try:
+                    _match_executor.submit(_update_matches, owner, ids)
+                except RuntimeError:
+                    # interpreter exiting; rebuild-top catches these up
+                    print(f"❌ Skipped match updates for {len(ids)} new {owner}s")
+
+
+def shutdown():
+    """Write everything still queued, then stop the writer (app shutdown)."""
+    global _writer, _match_executor
+    with _writer_lock:
+        if _writer is None:
+            return
+        _queue.put(None)
+        _writer.join()
+        _match_executor.shutdown(wait=True)
+        _writer = _match_executor = None
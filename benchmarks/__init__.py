@@ -0,0 +1,2 @@
+# Benchmarks for the matching and data paths.
+# Run with: python -m benchmarks.run --sizes 1000 10000 100000
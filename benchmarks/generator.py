@@ -0,0 +1,79 @@
+# generator.py
+#
+# Seeded synthetic designer / founder submissions, using the same option
+# vocabularies as the forms in backend/templates and frontend/.
+
+import random
+
+NICHES = [
+    "AI", "Automotive", "E-commerce", "Education / EdTech", "Fashion & Lifestyle",
+    "Fintech", "Gaming", "Health & Wellness", "SaaS", "Travel & Hospitality",
+]
+AVAILABILITY = ["Weekdays", "Weekends", "Evenings", "Flexible"]
+DESIGN_FOCUS = ["UI Design", "UX Design", "Branding", "Product Design"]
+INTEREST_AREAS = ["Mobile App Design", "Web Design", "Design Systems", "Not Sure"]
+UNPAID_EXPERIENCE = ["Yes", "No"]
+GOALS = ["Portfolio pieces", "Real-world experience", "Skill improvement"]
+TOOLS = ["Figma", "Illustrator", "Photoshop", "Webflow", "Notion", "Slack", "Framer", "Airtable"]
+FIGMA_EXPERIENCE = ["Beginner", "Intermediate", "Confident"]
+RESOURCES = ["Mentorship", "Templates", "Community"]
+
+PROJECT_STAGES = ["Idea", "MVP", "Prototype", "Launched"]
+PAID_ROLES = ["Paid", "Unpaid"]
+HOURS = ["1–3 hours per week", "3–5 hours per week", "5-10 hrs", "10 hours", "2", "", "Flexible"]
+SUPPORT_LEVELS = ["high", "low"]
+CITIES = ["Lagos, Nigeria", "Berlin, Germany", "Toronto, Canada", "Austin, USA", "Manila, Philippines"]
+
+
+def _some(rng, options, lo=0, hi=3):
+    return rng.sample(options, rng.randint(lo, min(hi, len(options))))
+
+
+def designer(rng, i):
+    """One designer submission, shaped like save_designer's input."""
+    return {
+        "full_name": f"Designer {i}",
+        "email": f"designer{i}@example.com",
+        "city_country": rng.choice(CITIES),
+        "portfolio": f"https://portfolio.example.com/d{i}",
+        "availability": _some(rng, AVAILABILITY, 1, 3),
+        "focus": _some(rng, DESIGN_FOCUS, 1, 3),
+        "interest_areas": _some(rng, INTEREST_AREAS, 0, 2),
+        "unpaid_experience": _some(rng, UNPAID_EXPERIENCE, 0, 1),
+        "goals": _some(rng, GOALS, 0, 2),
+        "niche_interest": _some(rng, NICHES, 0, 4),
+        "tools": _some(rng, TOOLS, 1, 4),
+        "figma_experience": _some(rng, FIGMA_EXPERIENCE, 1, 1),
+        "resources": _some(rng, RESOURCES, 0, 2),
+        "extra_notes": rng.choice(["", "Happy to help early-stage teams.", "Looking for mobile work."]),
+        "newsletter": rng.choice(["", "Yes"]),
+    }
+
+
+def founder(rng, i):
+    """One founder submission, shaped like save_founder's input."""
+    return {
+        "full_name": f"Founder {i}",
+        "email": f"founder{i}@example.com",
+        "project_name": f"Project {i}",
+        "website": f"https://project{i}.example.com",
+        "project_stage": _some(rng, PROJECT_STAGES, 1, 1),
+        "design_help": _some(rng, DESIGN_FOCUS, 1, 3),
+        "tools_used": ", ".join(_some(rng, TOOLS, 0, 3)),
+        "paid_role": _some(rng, PAID_ROLES, 1, 1),
+        "niche": _some(rng, NICHES, 1, 2),
+        "estimated_hours": rng.choice(HOURS),
+        "beginner_friendly": rng.choice(["", "Yes", "No"]),
+        "support_level": _some(rng, SUPPORT_LEVELS, 1, 1),
+        "extra_notes": rng.choice(["", "Need a landing page first.", "Dashboard redesign."]),
+    }
+
+
+def designers(n, seed=0, start=0):
+    rng = random.Random(f"designers-{seed}")
+    return [designer(rng, start + i) for i in range(n)]
+
+
+def founders(n, seed=0, start=0):
+    rng = random.Random(f"founders-{seed}")
+    return [founder(rng, start + i) for i in range(n)]
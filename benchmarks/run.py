@@ -0,0 +1,211 @@
+# run.py
+#
+# Reproducible benchmarks for the matching and data paths on a temporary
+# SQLite database.
+#
+#   python -m benchmarks.run --sizes 1000 10000 100000
+#   python -m benchmarks.run --sizes 1000 --compare benchmarks/results/baseline.json
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# always the throwaway SQLite file below, never a configured PostgreSQL
+# (read once, when backend.database is imported)
+os.environ.pop("DATABASE_URL", None)
+
+from backend import database, database_matches, match, profile_cache
+from benchmarks import generator
+
+# gitignored; copy a run elsewhere in results/ to keep it as a baseline
+DEFAULT_OUT = Path(__file__).resolve().parent / "results" / "latest.json"
+
+# fixed per-size sample counts, so numbers stay comparable between runs
+SCORE_PAIRS = 20000
+MATRIX_FOUNDERS = 100
+FIND_BEST_FOUNDERS = 200
+SAVES = 50
+MATCH_LOG_ROWS_PER_PROFILE = 1
+
+
+def _timings(fn, repeat):
+    """Run fn() `repeat` times; return per-call stats in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return _stats(samples)
+
+
+def _stats(samples):
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+    }
+
+
+def _once(fn):
+    start = time.perf_counter()
+    fn()
+    return _stats([(time.perf_counter() - start) * 1000])
+
+
+# -----------------------------
+# fixture loading
+# -----------------------------
+
+def _joined(value):
+    return ",".join(value) if isinstance(value, list) else (value or "")
+
+
+def _bulk_load(designers, founders, seed):
+    """
+    Load generated rows straight into the tables, skipping the per-row
+    tag mirroring / top-K maintenance that the save benchmarks measure.
+    """
+    conn = database.get_connection()
+    cur = conn.cursor()
+    for table, columns, rows in (
+        ("designers", database.DESIGNER_COLUMNS, designers),
+        ("founders", database.FOUNDER_COLUMNS, founders),
+    ):
+        cur.executemany(f"""
+            INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})
+        """, [tuple(_joined(row[column]) for column in columns) for row in rows])
+
+    rng = random.Random(f"matches-{seed}")
+    cur.executemany("""
+        INSERT INTO matches (founder_email, designer_email, score) VALUES (?, ?, ?)
+    """, [
+        (rng.choice(founders)["email"], rng.choice(designers)["email"], round(rng.random(), 4))
+        for _ in range(len(founders) * MATCH_LOG_ROWS_PER_PROFILE)
+    ])
+    conn.commit()
+    conn.close()
+
+
+def _reset_caches():
+    profile_cache.clear()
+    match._designer_index = None
+
+
+# -----------------------------
+# benchmarks
+# -----------------------------
+
+def bench_size(size, seed, workdir):
+    print(f"▶ size={size}", file=sys.stderr)
+    database.close_pool()
+    database.DB_PATH = Path(workdir) / f"bench_{size}.db"
+    database.init_db()
+    _reset_caches()
+
+    designers = generator.designers(size, seed)
+    founders = generator.founders(size, seed)
+    results = {"bulk_load": _once(lambda: _bulk_load(designers, founders, seed))}
+
+    # pure scoring
+    rng = random.Random(f"pairs-{seed}")
+    pairs = [(rng.choice(founders), rng.choice(designers)) for _ in range(SCORE_PAIRS)]
+    results["compute_match_score"] = _once(
+        lambda: [match.compute_match_score(f, d) for f, d in pairs]
+    )
+    results["compute_match_score"]["pairs"] = SCORE_PAIRS
+
+    designer_dicts = [database.format_designer(row) for row in database.iter_designers()]
+    founder_rows = database.get_founders_page(0, max(MATRIX_FOUNDERS, FIND_BEST_FOUNDERS))
+    founder_dicts = [database.format_founder(row) for row in founder_rows]
+
+    _reset_caches()
+    results["score_matrix"] = _once(
+        lambda: match.score_matrix(founder_dicts[:MATRIX_FOUNDERS], designer_dicts)
+    )
+    results["score_matrix"]["pairs"] = MATRIX_FOUNDERS * len(designer_dicts)
+
+    # retrieval
+    _reset_caches()
+    results["designer_index_build"] = _once(match.get_designer_index)
+    rows = iter(founder_rows[:FIND_BEST_FOUNDERS])
+    results["find_best_designer_for_founder"] = _timings(
+        lambda: match.find_best_designer_for_founder(next(rows)), FIND_BEST_FOUNDERS
+    )
+
+    # writes (each includes tag mirroring + incremental top-K maintenance)
+    extra_designers = iter(generator.designers(SAVES, seed + 1, start=size))
+    extra_founders = iter(generator.founders(SAVES, seed + 1, start=size))
+    results["save_designer"] = _timings(lambda: database.save_designer(next(extra_designers)), SAVES)
+    results["save_founder"] = _timings(lambda: database.save_founder(next(extra_founders)), SAVES)
+
+    # match log reads
+    results["get_all_match_records"] = _timings(database_matches.get_all_match_records, 5)
+    results["get_match_records"] = _timings(lambda: database_matches.get_match_records(limit=100), 20)
+
+    database.close_pool()
+    return results
+
+
+def compare(current, baseline, threshold):
+    """
+    Print mean-time ratios vs a baseline; return the regressions
+    (ratio above `threshold`).
+    """
+    regressions = []
+    for size, benches in current["results"].items():
+        for name, stats in benches.items():
+            before = baseline.get("results", {}).get(size, {}).get(name)
+            if not before or not before["mean_ms"]:
+                continue
+            ratio = stats["mean_ms"] / before["mean_ms"]
+            flag = "❌" if ratio > threshold else "  "
+            print(f"{flag} {size:>7} {name:<32} {before['mean_ms']:>10.3f} → {stats['mean_ms']:>10.3f} ms  ({ratio:.2f}x)")
+            if ratio > threshold:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matching / data path benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="profiles per side (default: 1000 10000 100000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="where to write the JSON results")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="fail when a benchmark is this many times slower than the baseline")
+    args = parser.parse_args(argv)
+
+    report = {
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="playground-bench-") as workdir:
+        for size in args.sizes:
+            report["results"][str(size)] = bench_size(size, args.seed, workdir)
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2))
+    print(f"✅ Results written to {args.out}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) over {args.threshold}x")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import os
+
+# tests always run on a throwaway SQLite file, never a configured PostgreSQL
+os.environ.pop("DATABASE_URL", None)
+
+import pytest
+
+from backend import database, match, profile_cache, write_queue
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh, migrated SQLite database for one test."""
+    database.close_pool()
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "test.db")
+    database.init_db()
+    profile_cache.clear()
+    match._designer_index = None
+    yield database
+    write_queue.shutdown()
+    database.close_pool()
+    match._designer_index = None
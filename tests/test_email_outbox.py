@@ -0,0 +1,99 @@
+import pytest
+
+from backend import email_outbox, email_utils
+
+
+class Clock:
+    """Stand-in for the time module, moved by hand."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class Sender:
+    """Stand-in for email_utils.send_email: fails the first `failures` calls."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def __call__(self, to, subject, html):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("resend is down")
+        self.sent.append(to)
+        return {"id": f"msg-{len(self.sent)}"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(email_outbox, "time", clock)
+    return clock
+
+
+def _row(db, outbox_id):
+    conn = db.get_connection()
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT status, attempts, next_attempt_at, last_error FROM email_outbox WHERE id = ?
+    """, (outbox_id,))
+    row = cur.fetchone()
+    conn.close()
+    return row
+
+
+def test_claimed_row_is_leased_until_expiry(db, clock):
+    outbox_id = email_outbox.enqueue_email("a@x.io", "Hi", "<p>hi</p>")
+
+    first = email_outbox._claim_due(10, clock.now)
+    assert [row[0] for row in first] == [outbox_id]
+    # a second worker sees nothing while the lease holds
+    assert email_outbox._claim_due(10, clock.now) == []
+    assert email_outbox._claim_due(10, clock.now + email_outbox.EMAIL_OUTBOX_LEASE_SECONDS - 1) == []
+
+    # the first worker died mid-send: the row is due again once the lease expires
+    again = email_outbox._claim_due(10, clock.now + email_outbox.EMAIL_OUTBOX_LEASE_SECONDS)
+    assert [(row[0], row[4]) for row in again] == [(outbox_id, 2)]
+    assert _row(db, outbox_id)[:2] == ("sending", 2)
+
+
+def test_failed_send_is_retried_with_backoff(db, clock, monkeypatch):
+    sender = Sender(failures=2)
+    monkeypatch.setattr(email_utils, "send_email", sender)
+    outbox_id = email_outbox.enqueue_email("a@x.io", "Hi", "<p>hi</p>")
+    base = email_outbox.EMAIL_OUTBOX_BACKOFF_BASE
+
+    assert email_outbox.process_outbox() == (0, 1)
+    status, attempts, next_attempt_at, error = _row(db, outbox_id)
+    assert (status, attempts, error) == ("pending", 1, "resend is down")
+    assert next_attempt_at == pytest.approx(clock.now + base)
+
+    # not due yet
+    assert email_outbox.process_outbox() == (0, 0)
+
+    clock.now += base
+    assert email_outbox.process_outbox() == (0, 1)
+    # backoff doubles
+    assert _row(db, outbox_id)[2] == pytest.approx(clock.now + 2 * base)
+
+    clock.now += 2 * base
+    assert email_outbox.process_outbox() == (1, 0)
+    assert _row(db, outbox_id)[:2] == ("sent", 3)
+    assert sender.sent == ["a@x.io"]
+
+
+def test_gives_up_after_max_attempts(db, clock, monkeypatch):
+    monkeypatch.setattr(email_utils, "send_email", Sender(failures=100))
+    monkeypatch.setattr(email_outbox, "EMAIL_OUTBOX_MAX_ATTEMPTS", 3)
+    outbox_id = email_outbox.enqueue_email("a@x.io", "Hi", "<p>hi</p>")
+
+    for _ in range(3):
+        assert email_outbox.process_outbox() == (0, 1)
+        clock.now += email_outbox.EMAIL_OUTBOX_BACKOFF_MAX
+
+    assert _row(db, outbox_id)[:2] == ("failed", 3)
+    assert email_outbox.process_outbox() == (0, 0)
@@ -0,0 +1,90 @@
+import asyncio
+import queue
+
+import pytest
+
+from backend import write_queue
+
+
+def _designer(i, email=None, tools=("Figma",)):
+    return {"full_name": f"Designer {i}", "email": email or f"d{i}@x.io", "tools": list(tools)}
+
+
+def _count(db, sql):
+    conn = db.get_connection()
+    cur = conn.cursor()
+    cur.execute(sql)
+    n = cur.fetchone()[0]
+    conn.close()
+    return n
+
+
+async def _submit_all(submissions):
+    return await asyncio.gather(*(write_queue.submit(*s) for s in submissions))
+
+
+def test_concurrent_submissions_commit_with_their_emails(db):
+    submissions = [
+        ("designer", _designer(i), (f"d{i}@x.io", "Welcome", "<p>hi</p>")) for i in range(20)
+    ] + [
+        ("founder", {"full_name": f"Founder {i}", "email": f"f{i}@x.io"}, None) for i in range(5)
+    ]
+
+    ids = asyncio.run(_submit_all(submissions))
+
+    assert len(set(ids[:20])) == 20 and len(set(ids[20:])) == 5
+    for i, designer_id in enumerate(ids[:20]):
+        assert db.get_designer_by_id(designer_id)[2] == f"d{i}@x.io"
+    assert _count(db, "SELECT COUNT(*) FROM email_outbox") == 20
+    assert _count(db, "SELECT COUNT(*) FROM founders") == 5
+
+
+def test_resubmission_in_one_batch_upserts(db):
+    ids = asyncio.run(_submit_all([
+        ("designer", _designer(1, "same@x.io", ["Figma"]), None),
+        ("designer", _designer(2, " SAME@x.io ", ["Framer"]), None),
+    ]))
+
+    assert ids[0] == ids[1]
+    row = db.get_designer_by_id(ids[0])
+    assert (row[1], row[11]) == ("Designer 2", "Framer")
+    assert _count(db, "SELECT COUNT(*) FROM designers") == 1
+
+
+def test_bad_submission_fails_alone(db):
+    async def submit():
+        return await asyncio.gather(
+            write_queue.submit("designer", _designer(1)),
+            write_queue.submit("designer", _designer(2, email="  ")),
+            return_exceptions=True,
+        )
+
+    good, bad = asyncio.run(submit())
+
+    assert isinstance(good, int)
+    assert isinstance(bad, ValueError)
+    assert _count(db, "SELECT COUNT(*) FROM designers") == 1
+
+
+def test_full_queue_rejects_right_away(db, monkeypatch):
+    full = queue.Queue(maxsize=1)
+    full.put_nowait(object())
+    monkeypatch.setattr(write_queue, "_queue", full)
+    monkeypatch.setattr(write_queue, "_ensure_writer", lambda: None)   # nothing drains it
+
+    with pytest.raises(write_queue.WriteQueueFull):
+        asyncio.run(write_queue.submit("designer", _designer(1)))
+
+
+def test_match_updates_follow_the_commit(db):
+    founder_id = db.save_founder({
+        "full_name": "F", "email": "f@x.io", "niche": ["Fintech"], "tools_used": "Figma",
+    })
+
+    designer_id, = asyncio.run(_submit_all([
+        ("designer", {**_designer(1), "niche_interest": ["Fintech"]}, None),
+    ]))
+    write_queue.shutdown()   # waits for the match updates
+
+    from backend.database_matches import get_top_designers_for_founder
+    assert [d["id"] for d, _ in get_top_designers_for_founder(founder_id)] == [designer_id]